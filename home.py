@@ -1,5 +1,5 @@
 import streamlit as st
-from PIL import Image
+from utils.warmup import start_warmup
 
 # Set page configuration
 st.set_page_config(
@@ -23,6 +23,7 @@ st.write(
 
 # Add a welcome image or logo (optional)
 # Uncomment if you have a logo image file, like `logo.png`
+# from PIL import Image
 # image = Image.open("logo.png")
 # st.image(image, use_column_width=True)
 
@@ -66,3 +67,6 @@ st.write(
     The power to create high-quality educational content is at your fingertips. Let’s build something amazing! 💡
     """
 )
+
+# Load the heavy page dependencies in the background while the user reads
+start_warmup()
@@ -1,38 +1,29 @@
 import streamlit as st
-from PyPDF2 import PdfReader
-from fpdf import FPDF
 import unicodedata
 import base64
-import os
-import google.generativeai as genai
-from google.generativeai import GenerativeModel
 from dotenv import load_dotenv
-from prompts.dictator_prompt import DICTATOR_PROMPT
-import json
 from prompts.tabler_prompt import TABLER_PROMPT
+from utils.outline import extract_module_lessons
+from utils.prefetch import speculate, take
+from utils.llm import LazyChat
+from utils.syllabus import extract_syllabus_text
+from utils.artifacts import put_artifact, get_artifact, has_artifact
+from utils.tracing import begin_page, end_page, traced
+from utils.warmup import start_warmup
 
 # Load API key from environment
 load_dotenv()
-geminiAPIKey = os.getenv("API_KEY")
 
 # Configure the Generative AI model
-try:
-    genai.configure(api_key=geminiAPIKey)
-    model = GenerativeModel()
-    chat = model.start_chat(history=[])
-except Exception as e:
-    st.error(f"Unable to setup generative model: {e}")
-
-# Function to parse PDF content
-def parse_pdf(file):
-    reader = PdfReader(file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() + "\n"
-    return text.strip()
+content_chat = LazyChat("content")
+formatting_chat = LazyChat("formatting")
+extraction_chat = LazyChat("extraction")
 
 # Function to generate a structured PDF file
+@traced("generate_pdf")
 def generate_pdf(content, filename):
+    from fpdf import FPDF
+
     content = unicodedata.normalize('NFKD', content).encode('ascii', 'ignore').decode('ascii')
     
     # Initialize PDF
@@ -71,14 +62,16 @@ def download_pdf(pdf_filename):
 
 # Set up the Streamlit page
 st.set_page_config(page_title="Generate Course Outline From PDF", layout="wide")
+page_run = begin_page(st.session_state, "PDFBasedCourse")
 st.title("Generate Course Outline From PDF 📝")
 
 # PDF file upload
 uploaded_file = st.file_uploader("Upload a PDF file", type=["pdf"])
+full_text = st.checkbox("Send the full PDF text", value=False,
+                        help="By default only the pages with the module table, hours and textbooks are sent to the model.")
 if uploaded_file is not None:
-    parsed_text = parse_pdf(uploaded_file)
-    st.session_state["parsed_text"] = parsed_text
-    st.success("PDF parsed successfully!")
+    parsed_text, pages_used, page_count = extract_syllabus_text(uploaded_file, relevant_only=not full_text)
+    st.success(f"PDF parsed successfully! Using {pages_used} of {page_count} pages.")
 
     # Structure the content based on provided prompt
     structure_prompt = f"""
@@ -111,7 +104,7 @@ if uploaded_file is not None:
     **Reference Books**: Provide a list of additional reference materials or suggested readings, including authors and publication details.
 
     Here's the input text to restructure:
-    {st.session_state['parsed_text']}
+    {parsed_text}
     
     Please maintain the same content and meaning but organize it strictly in the specified format. Ensure all sections are covered, even if they need to be inferred from the provided content.
     """
@@ -120,11 +113,11 @@ if uploaded_file is not None:
 if st.button("Format The PDF"):
     with st.spinner("Formatting content..."):
         try:
-            response = chat.send_message(structure_prompt)
+            response = formatting_chat.send_message(structure_prompt)
             formatted_content = response.text
 
             if formatted_content:
-                st.session_state["formatted_content"] = formatted_content
+                put_artifact(st.session_state, "formatted_content", formatted_content)
                 st.session_state["is_formatted"] = True  # Set flag for formatted content
                 st.success("Content formatted successfully! 🎉")
 
@@ -134,9 +127,19 @@ if st.button("Format The PDF"):
         except Exception as e:
             st.error(f"An error occurred while formatting the content: {e}")
 
+# The formatted text is gone if this session was abandoned long enough to be deleted
+if st.session_state.get("is_formatted", False) and not has_artifact(st.session_state, "formatted_content"):
+    st.session_state["is_formatted"] = False
+    st.session_state["is_modifying"] = False
+
 # Show next steps after formatting
 if st.session_state.get("is_formatted", False):
     st.markdown("---")
+    formatted_content = get_artifact(st.session_state, "formatted_content", "")
+
+    # "Modify Syllabus" starts from the DICTator parse, so run it while the user reads
+    speculate(st.session_state, "module_lessons", formatted_content,
+              extract_module_lessons, LazyChat("extraction"), formatted_content)
     
     col1, col2 = st.columns(2)
 
@@ -144,8 +147,9 @@ if st.session_state.get("is_formatted", False):
     with col1:
         if st.button("Download Formatted PDF"):
             pdf_filename = "formatted_content.pdf"
-            generate_pdf(st.session_state["formatted_content"], pdf_filename)
+            generate_pdf(formatted_content, pdf_filename)
             download_pdf(pdf_filename)
+            end_page(page_run)
             st.stop()  
     with col2:
         if st.button("Modify Syllabus"):
@@ -154,16 +158,13 @@ if st.session_state.get("is_formatted", False):
 if st.session_state.get("is_modifying", False):
     st.markdown("---")
     st.subheader("Modify Course Outline")
+    formatted_content = get_artifact(st.session_state, "formatted_content", "")
 
     try:
-        response = chat.send_message(DICTATOR_PROMPT)
-        response = chat.send_message(st.session_state["formatted_content"])
-        Dict = response.text
-        cleaned_text = Dict.replace("```python", "").replace("```", "").strip()
-
         try:
-            module_lessons = eval(cleaned_text)
-        except json.JSONDecodeError as e:
+            module_lessons = take(st.session_state, "module_lessons", formatted_content,
+                                  extract_module_lessons, extraction_chat, formatted_content)
+        except Exception as e:
             st.error(f"Error parsing JSON: {e}")
             module_lessons = {}
 
@@ -195,22 +196,22 @@ if st.session_state.get("is_modifying", False):
             
             
             Course Outline:
-            {st.session_state['formatted_content']}
+            {formatted_content}
 
             give the output as plaintext.
 
             """
 
-            response = chat.send_message(TABLER_PROMPT)
-            response = chat.send_message(mod_text)
+            response = content_chat.send_message(TABLER_PROMPT)
+            response = content_chat.send_message(mod_text)
 
             Mod_CO = response.text
-            st.session_state["modified_course_outline"] = Mod_CO
+            put_artifact(st.session_state, "modified_course_outline", Mod_CO)
 
             st.success("Modified course outline generated! 🎉")
 
             with st.expander("Modified Course Outline"):
-                st.write(st.session_state["modified_course_outline"],unsafe_allow_html=True)
+                st.write(Mod_CO,unsafe_allow_html=True)
 
     except Exception as e:
         st.error(f"An error occurred while modifying the syllabus: {e}")
@@ -219,5 +220,8 @@ if st.session_state.get("is_modifying", False):
     st.markdown("---")
     if st.button("Download Modified PDF"):
         pdf_filename = "modified_course_outline.pdf"
-        generate_pdf(st.session_state["modified_course_outline"], pdf_filename)
+        generate_pdf(get_artifact(st.session_state, "modified_course_outline", ""), pdf_filename)
         download_pdf(pdf_filename)
+
+end_page(page_run)
+start_warmup()
@@ -1,20 +1,21 @@
-import google.generativeai as genai
-from google.generativeai import GenerativeModel
 import streamlit as st
 from dotenv import load_dotenv
-import os
-import json
 import shelve
 import unicodedata
-from fpdf import FPDF # type: ignore
 import base64
 from prompts.tabler_prompt import TABLER_PROMPT
-from prompts.dictator_prompt import DICTATOR_PROMPT
+from utils.outline import generate_outline_fast, generate_outline_with_prompter, extract_module_lessons
+from utils.prefetch import speculate, take, cancel
+from utils.llm import LazyChat
+from utils.artifacts import put_artifact, get_artifact, has_artifact, drop_artifacts
+from utils.tracing import begin_page, end_page, traced
+from utils.warmup import start_warmup
 
 
-geminiAPIKey = os.getenv("API_KEY")
-
+@traced("generate_pdf")
 def generate_pdf(content, filename):
+    from fpdf import FPDF # type: ignore
+
     content = unicodedata.normalize('NFKD', content).encode('ascii', 'ignore').decode('ascii')
     
     pdf = FPDF()
@@ -44,18 +45,16 @@ st.set_page_config(
 
 load_dotenv()
 
+page_run = begin_page(st.session_state, "PromptBasedCourse")
+
 st.title("Automated Course Content Generator 🤖")
 
 USER_AVATAR = "👤"
 BOT_AVATAR = "🤖"
 
-try:
-    genai.configure(api_key=geminiAPIKey)
-    model = GenerativeModel()
-    chat = model.start_chat(history=[])
-
-except :
-    print("Unable to setup gemini")
+chat = LazyChat("outline")
+content_chat = LazyChat("content")
+extraction_chat = LazyChat("extraction")
 
 
 def load_chat_history():
@@ -66,13 +65,14 @@ def save_chat_history(messages):
     with shelve.open("chat_history") as db:
         db["messages"] = messages
 
-if "messages" not in st.session_state:
-    st.session_state.messages = load_chat_history()
+if not has_artifact(st.session_state, "messages"):
+    put_artifact(st.session_state, "messages", load_chat_history())
 
 with st.sidebar:
     if st.button("Delete Chat History"):
-        st.session_state.messages = []
+        put_artifact(st.session_state, "messages", [])
         save_chat_history([])
+    fast_outline = st.checkbox("Skip Prompter (faster outline)", value=True, help="Build the Tabler request locally and generate the outline in a single call.")
 
 col1, col2 = st.columns(2)
 
@@ -118,6 +118,8 @@ with col1:
                 st.session_state.course_duration = ""
                 st.session_state.course_credit = ""
                 st.session_state.pdf = False
+                cancel(st.session_state)
+                drop_artifacts(st.session_state, ["course_outline", "modified_course_outline"])
                 st.experimental_rerun()
                 
 with col2:
@@ -128,32 +130,40 @@ with col2:
         
         # Include user selections in the message history
         user_selections = f"Course Name: {course_name}\nTarget Audience Edu Level: {target_audience_edu_level}\nDifficulty Level: {difficulty_level}\nNo. of Modules: {num_modules}\nCourse Duration: {course_duration}\nCourse Credit: {course_credit}"
-        st.session_state.messages.append({"role": "user", "parts": user_selections})
+        put_artifact(st.session_state, "messages",
+                     get_artifact(st.session_state, "messages", []) + [{"role": "user", "parts": user_selections}])
+
+        course_details = {
+            "course_name": course_name,
+            "target_audience_edu_level": target_audience_edu_level,
+            "difficulty_level": difficulty_level,
+            "num_modules": num_modules,
+            "course_duration": course_duration,
+            "course_credit": course_credit,
+        }
 
-        PROMPT=f"You are Prompter, the world's best Prompt Engineer. I am using another GenAI tool, Tabler, that helps in generating a course outline for trainers and professionals for the automated course content generation for their courses. Your job is to strictly use the only following inputs: 1) Course Name: {course_name} 2) Target Audience Edu Level: {target_audience_edu_level} 3) Course Difficulty Level: {difficulty_level} 4) No. of Modules: {num_modules} 5) Course Duration: {course_duration} 6) Course Credit: {course_credit}.  to generate a prompt for Tabler so that it can produce the best possible outputs. The prompt that you generate must be comprehensive and strictly follow the above given inputs and also mention the given inputs in the prompt you generate. Moreover, it is your job to also identify if the course name is appropriate and not gibberish."
-
-        response= chat.send_message(PROMPT)
-
-        generated_prompt = response.text
-        print(generated_prompt)
-        
-        
         with st.spinner("Generating course outline..."):
 
-            response = chat.send_message(TABLER_PROMPT)
-            response = chat.send_message(generated_prompt)
+            if fast_outline:
+                Course_outline, _ = generate_outline_fast(chat, course_details)
+            else:
+                Course_outline, _ = generate_outline_with_prompter(chat, course_details)
 
-            Course_outline = response.text
             st.success("Course outline generated successfully!")
  
 
-            st.session_state['course_outline'] = Course_outline
+            put_artifact(st.session_state, 'course_outline', Course_outline)
             st.session_state['buttons_visible'] = True
 
     
-    if 'course_outline' in st.session_state and "pdf" not in st.session_state:
+    if has_artifact(st.session_state, 'course_outline') and "pdf" not in st.session_state:
+        course_outline = get_artifact(st.session_state, 'course_outline', "")
         with st.expander("Course Outline"):
-            st.write(st.session_state['course_outline'])
+            st.write(course_outline)
+
+        # Both follow-up buttons start from the DICTator parse, so run it while the user reads
+        speculate(st.session_state, "module_lessons", course_outline,
+                  extract_module_lessons, LazyChat("extraction"), course_outline)
 
         if 'buttons_visible' in st.session_state and st.session_state['buttons_visible']:
             button1, button2 = st.columns([1, 2])
@@ -172,27 +182,18 @@ with col2:
 
             if 'complete_course' in st.session_state and st.session_state['complete_course']:
                 with st.spinner("Generating complete course..."):
-                    response = chat.send_message(DICTATOR_PROMPT)
-                    response = chat.send_message(st.session_state['course_outline'])
-                    print('before parsing')
-                    print(st.session_state['course_outline'])
-
-                    Dict = response.text
-                    
-                  
-                    cleaned_text = Dict.replace("```python", "").replace("```", "").strip()
-
-                    # Now load the JSON-compatible string
                     try:
-                        module_lessons = eval(cleaned_text)
+                        module_lessons = take(st.session_state, "module_lessons", course_outline,
+                                              extract_module_lessons, extraction_chat, course_outline)
                         print("Parsed JSON:", module_lessons)
-                    except json.JSONDecodeError as e:
+                    except Exception as e:
                         print("Error parsing JSON:", e)
                     
 
                     if "pdf" not in st.session_state:
                         # complete_course_content = module_content 
-                        st.session_state.pdf = generate_pdf(st.session_state['course_outline'], "course.pdf")
+                        generate_pdf(course_outline, "course.pdf")
+                        st.session_state.pdf = True
                         with open("course.pdf","rb") as pdf_file: 
                                 PDFbyte = pdf_file.read()
 
@@ -206,15 +207,11 @@ with col2:
 
                 
             elif 'modifications' in st.session_state:
-                response = chat.send_message(DICTATOR_PROMPT)
-                response = chat.send_message(st.session_state['course_outline'])
-                Dict = response.text
-                cleaned_text = Dict.replace("```python", "").replace("```", "").strip()
-
                 try:
-                    module_lessons = eval(cleaned_text)
+                    module_lessons = take(st.session_state, "module_lessons", course_outline,
+                                          extract_module_lessons, extraction_chat, course_outline)
                     print("Parsed JSON:", module_lessons)
-                except json.JSONDecodeError as e:
+                except Exception as e:
                     print("Error parsing JSON:", e)
                     module_lessons = {}
 
@@ -253,27 +250,28 @@ with col2:
                     {st.session_state.modifications['content_changes']}
                     
                     Course Outline:
-                    {st.session_state['course_outline']}
+                    {course_outline}
 give the output as plaintext.
 
 
                     """
 
-                    response = chat.send_message(TABLER_PROMPT)
-                    response = chat.send_message(mod_text)
+                    response = content_chat.send_message(TABLER_PROMPT)
+                    response = content_chat.send_message(mod_text)
 
                     Mod_CO = response.text
-                    st.session_state["modified_course_outline"] = Mod_CO
+                    put_artifact(st.session_state, "modified_course_outline", Mod_CO)
 
                     st.success("Modified course outline generated! 🎉")
 
                     with st.expander("Modified Course Outline"):
-                        st.write(st.session_state["modified_course_outline"],unsafe_allow_html=True)
+                        st.write(Mod_CO,unsafe_allow_html=True)
 
                         # Generate the PDF if not already created
                         if "pdf" not in st.session_state:
                             # complete_course_content = module_content 
-                            st.session_state.pdf = generate_pdf(st.session_state['modified_course_outline'], "course.pdf")
+                            generate_pdf(Mod_CO, "course.pdf")
+                            st.session_state.pdf = True
                             #b64 = base64.b64encode(st.session_state.pdf.output(dest="S").encode("latin1")).decode()
                             with open("course.pdf","rb") as pdf_file: 
                                 PDFbyte = pdf_file.read()
@@ -291,4 +289,7 @@ give the output as plaintext.
         st.write("Your generated content will appear here.")
 
 # Save chat history after each interaction
-save_chat_history(st.session_state.messages)
+save_chat_history(get_artifact(st.session_state, "messages", []))
+
+end_page(page_run)
+start_warmup()
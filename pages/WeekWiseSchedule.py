@@ -1,42 +1,34 @@
 import streamlit as st
-from PyPDF2 import PdfReader
-from fpdf import FPDF
-import unicodedata
 import base64
 import os
-import google.generativeai as genai
-from google.generativeai import GenerativeModel
 from dotenv import load_dotenv
-import json
 from datetime import datetime, timedelta
-import re
-import plotly.figure_factory as ff
-import pandas as pd
-import plotly.express as px
 import traceback
+from utils.llm import LazyChat
+from utils.syllabus import extract_syllabus_text
+from utils.artifacts import cached_artifact
+from utils.export import EXPORT_FORMATS, export_filename, export_schedule
+from utils.json_stream import parse_json_response, stream_json_entries
+from utils.modules import align_modules, fetch_missing_topics
+from utils.schedule import generate_schedules, is_week, layout_schedule, module_weeks
+from utils.tracing import begin_page, end_page, traced
+from utils.warmup import start_warmup
 
 # Load API key from environment
 load_dotenv()
-geminiAPIKey = os.getenv("API_KEY")
 
-# Configure the Generative AI model
-try:
-    genai.configure(api_key=geminiAPIKey)
-    model = GenerativeModel()
-    chat = model.start_chat(history=[])
-except Exception as e:
-    st.error(f"Unable to setup generative model: {e}")
+EXPORT_LABELS = {"pdf": "PDF", "ical": "iCalendar", "csv": "CSV", "json": "JSON"}
 
-def parse_pdf(file):
-    """Parse PDF content."""
-    reader = PdfReader(file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() + "\n"
-    return text.strip()
+# Configure the Generative AI model
+chat = LazyChat("extraction")
 
+@traced("create_calendar_view")
 def create_calendar_view(schedule_data, start_date):
     """Create a Gantt chart visualization of the schedule."""
+    import pandas as pd
+    import plotly.express as px
+    import plotly.figure_factory as ff
+
     tasks = []
     colors = px.colors.qualitative.Set3
     color_map = {}
@@ -96,44 +88,12 @@ def create_calendar_view(schedule_data, start_date):
         st.error(f"Error creating Gantt chart: {str(e)}")
         return None
 
-def generate_pdf(content, filename):
-    """Generate PDF from content."""
-    content = unicodedata.normalize('NFKD', content).encode('ascii', 'ignore').decode('ascii')
-    pdf = FPDF()
-    pdf.add_page()
-    pdf.set_font('Arial', 'B', 12)
-    
-    sections = content.split('\n\n')
-    for section in sections:
-        if section.startswith('**') or section.startswith('Week'):
-            pdf.set_font('Arial', 'B', 12)
-            pdf.multi_cell(0, 10, section)
-        else:
-            pdf.set_font('Arial', '', 12)
-            pdf.multi_cell(0, 10, section)
-    
-    pdf.output(filename, 'F')
-    return pdf
-
 def extract_json_from_response(response_text):
-    """Extract JSON from model response text."""
-    try:
-        match = re.search(r'```(?:json|python)?\s*({[\s\S]*?})\s*```', response_text)
-        if match:
-            json_str = match.group(1)
-        else:
-            start = response_text.find('{')
-            end = response_text.rfind('}') + 1
-            if start != -1 and end != 0:
-                json_str = response_text[start:end]
-            else:
-                return None
-        
-        json_str = json_str.strip()
-        return json.loads(json_str)
-    except Exception as e:
-        st.error(f"Error extracting JSON: {str(e)}")
-        return None
+    """Extract JSON from model response text, repairing common formatting faults."""
+    data = parse_json_response(response_text)
+    if data is None:
+        st.error("Error extracting JSON: no parsable object in the model response")
+    return data
 
 def parse_duration(duration):
     """Helper function to parse duration values into float."""
@@ -153,11 +113,10 @@ def parse_duration(duration):
         return 3.0
     return 3.0
 
-def generate_week_schedule(module_content, module_duration, start_date):
-    """Generate weekly schedule for a module."""
-    duration = parse_duration(module_duration)
-    
-    schedule_prompt = f"""
+@traced("prompt build")
+def build_schedule_prompt(module_content, duration, start_date):
+    """Build the single-module schedule prompt."""
+    return f"""
     Create a detailed week-by-week schedule for the following module:
     
     Module Content: {module_content}
@@ -175,10 +134,21 @@ def generate_week_schedule(module_content, module_duration, start_date):
     }}
     Ensure all dates are in YYYY-MM-DD format.
     """
+
+def generate_week_schedule(module_content, module_duration, start_date, on_week=None):
+    """Generate weekly schedule for a module, calling on_week(week, details) as each week streams in."""
+    duration = parse_duration(module_duration)
+    schedule_prompt = build_schedule_prompt(module_content, duration, start_date)
     
     try:
-        response = chat.send_message(schedule_prompt)
-        schedule_data = extract_json_from_response(response.text)
+        schedule_data = {}
+        for week, details in stream_json_entries(LazyChat("schedule").send_message(schedule_prompt, stream=True)):
+            # Skip anything besides weeks the model adds, such as a "notes" entry
+            if not is_week(details):
+                continue
+            schedule_data[week] = details
+            if on_week:
+                on_week(week, details)
         if schedule_data:
             return schedule_data
         else:
@@ -195,30 +165,83 @@ def generate_week_schedule(module_content, module_duration, start_date):
         st.error(f"Error generating schedule: {str(e)}")
         return None
 
+def extract_modules(parsed_text):
+    """Extract the module durations and topics of a syllabus, re-asking only for modules whose topics are missing."""
+    duration_prompt = f"Analyze this syllabus and return a JSON with module names and durations in hours: {parsed_text}"
+    content_prompt = f"Analyze this syllabus and return a JSON with module names and their topics: {parsed_text}"
+    
+    week_data = extract_json_from_response(chat.send_message(duration_prompt).text)
+    content_data = extract_json_from_response(chat.send_message(content_prompt).text)
+    if not (week_data and content_data):
+        return None
+
+    # Match module names between the two extractions and only re-ask for the ones still missing
+    content_data, missing_modules = align_modules(week_data, content_data)
+    if missing_modules:
+        # A fresh chat, so the re-ask does not resend both whole-syllabus prompts as history
+        content_data.update(fetch_missing_topics(LazyChat("extraction"), missing_modules, parsed_text))
+        still_missing = [module for module in missing_modules if module not in content_data]
+        if still_missing:
+            st.warning(f"No topics found for: {', '.join(still_missing)}")
+    return week_data, content_data
+
+def generate_module_schedules(week_data, content_data, start_date):
+    """Generate the weekly topics, activities and objectives of every module, showing weeks as they stream in.
+
+    Returns the schedules and the modules no schedule could be generated for.
+    """
+    # Show each week as soon as the model finishes writing it
+    live_schedule = st.empty()
+    live_lines = []
+
+    def show_week(module, week, details):
+        topics = ", ".join(details.get('topics', [])) if isinstance(details, dict) else ""
+        live_lines.append(f"- **{module}** · {week}: {topics}")
+        live_schedule.markdown("\n".join(live_lines))
+
+    def show_module(module, schedule):
+        for week, details in schedule.items():
+            show_week(module, week, details)
+
+    def schedule_one(module, content, hours, module_start):
+        return generate_week_schedule(
+            content,
+            hours,
+            module_start,
+            on_week=lambda week, details: show_week(module, week, details)
+        )
+
+    # Modules run back to back, so each start date is known before any request
+    modules = []
+    current_date = start_date
+    for module, duration in week_data.items():
+        if module in content_data:
+            hours = parse_duration(duration)
+            modules.append((module, content_data[module], hours, current_date))
+            current_date += timedelta(weeks=module_weeks(hours))
+
+    # Several modules go into one request where they fit the token budget
+    schedules = generate_schedules(modules, schedule_one, on_module=show_module)
+    live_schedule.empty()
+    return schedules, [module for module in week_data if module not in schedules]
+
 def main():
-    st.set_page_config(page_title="Course Schedule Generator", layout="wide")
     st.title("Course Schedule Generator 📅")
 
-    try:
-        # Initialize Gemini model
-        load_dotenv()
-        geminiAPIKey = os.getenv("API_KEY")
-        genai.configure(api_key=geminiAPIKey)
-        model = GenerativeModel()
-        chat = model.start_chat(history=[])
-    except Exception as e:
-        st.error(f"Unable to setup generative model: {str(e)}")
-        st.error(f"Detailed error: {traceback.format_exc()}")
-        return
-
     # File upload
     uploaded_file = st.file_uploader("Upload Course Syllabus PDF", type=["pdf"])
+    full_text = st.checkbox("Send the full PDF text", value=False,
+                            help="By default only the pages with the module table, hours and textbooks are sent to the model.")
     
     if uploaded_file is not None:
         try:
-            parsed_text = parse_pdf(uploaded_file)
-            st.session_state["parsed_text"] = parsed_text
-            st.success("PDF parsed successfully!")
+            # Each stage is cached on its own inputs, so changing the schedule
+            # parameters only re-runs the date layout and the chart
+            upload = (getattr(uploaded_file, "file_id", uploaded_file.name), uploaded_file.size, full_text)
+            parsed_text, pages_used, page_count = cached_artifact(
+                st.session_state, "parsed_pdf", upload, extract_syllabus_text, uploaded_file, not full_text
+            )
+            st.success(f"PDF parsed successfully! Using {pages_used} of {page_count} pages.")
 
             # Schedule parameters
             with st.expander("Schedule Parameters"):
@@ -228,89 +251,81 @@ def main():
                 with col2:
                     total_weeks = st.number_input("Total Course Duration (weeks)", min_value=1, max_value=52, value=15)
 
+            # A click always asks the model again; reruns and parameter changes reuse the cache
+            schedules = None
             if st.button("Generate Schedule"):
                 with st.spinner("Generating course schedule..."):
                     try:
-                        # Get module information
-                        duration_prompt = f"Analyze this syllabus and return a JSON with module names and durations in hours: {parsed_text}"
-                        content_prompt = f"Analyze this syllabus and return a JSON with module names and their topics: {parsed_text}"
-                        
-                        week_data = extract_json_from_response(chat.send_message(duration_prompt).text)
-                        content_data = extract_json_from_response(chat.send_message(content_prompt).text)
-                        
-                        if week_data and content_data:
-                            # Generate schedule
-                            schedule_data = {}
-                            current_date = start_date
-                            
-                            for module, duration in week_data.items():
-                                if module in content_data:
-                                    schedule = generate_week_schedule(
-                                        content_data[module],
-                                        duration,
-                                        current_date
-                                    )
-                                    if schedule:
-                                        schedule_data[module] = schedule
-                                        weeks = max(1, round(parse_duration(duration) / 3))
-                                        current_date += timedelta(weeks=weeks)
-                            
-                            # Store schedule data
-                            st.session_state["schedule_data"] = schedule_data
-                            
-                            # Create visualization
-                            fig = create_calendar_view(schedule_data, start_date)
-                            if fig:
-                                st.plotly_chart(fig, use_container_width=True)
-                            
-                            # Display schedule details
-                            st.subheader("Detailed Schedule")
-                            for module, weeks in schedule_data.items():
-                                with st.expander(f"{module}"):
-                                    for week, details in weeks.items():
-                                        st.markdown(f"#### {week} ({details['dates']})")
-                                        st.markdown("**Topics:**")
-                                        for topic in details['topics']:
-                                            st.markdown(f"- {topic}")
-                                        st.markdown("**Activities:**")
-                                        for activity in details['activities']:
-                                            st.markdown(f"- {activity}")
-                                        st.markdown("**Learning Objectives:**")
-                                        for objective in details['objectives']:
-                                            st.markdown(f"- {objective}")
-                            
-                            # PDF download option
-                            if st.button("Download Schedule PDF"):
-                                pdf_filename = "course_schedule.pdf"
-                                schedule_text = ""
-                                for module, weeks in schedule_data.items():
-                                    schedule_text += f"\n\n{module}\n"
-                                    for week, details in weeks.items():
-                                        schedule_text += f"\n{week} ({details['dates']})\n"
-                                        schedule_text += "Topics:\n" + "\n".join(f"- {t}" for t in details['topics']) + "\n"
-                                        schedule_text += "Activities:\n" + "\n".join(f"- {a}" for a in details['activities']) + "\n"
-                                        schedule_text += "Objectives:\n" + "\n".join(f"- {o}" for o in details['objectives']) + "\n"
-                                
-                                generate_pdf(schedule_text, pdf_filename)
-                                with open(pdf_filename, "rb") as pdf_file:
-                                    pdf_data = pdf_file.read()
-                                    st.download_button(
-                                        label="Download Schedule PDF",
-                                        data=pdf_data,
-                                        file_name=pdf_filename,
-                                        mime="application/pdf"
-                                    )
-                        
+                        modules = cached_artifact(st.session_state, "schedule_modules", parsed_text,
+                                                  extract_modules, parsed_text, refresh=True)
+                        if modules:
+                            schedules, missing_modules = generate_module_schedules(*modules, start_date)
+                            if missing_modules:
+                                # Shown for this run only, so the next click retries the whole schedule
+                                st.warning(f"No schedule generated for: {', '.join(missing_modules)}. "
+                                           "Click Generate Schedule to try again.")
+                            else:
+                                cached_artifact(st.session_state, "schedule_topics", parsed_text,
+                                                lambda: schedules, refresh=True)
                         else:
                             st.error("Could not parse module information from the syllabus")
                     
                     except Exception as e:
                         st.error(f"Error generating schedule: {str(e)}")
                         st.error(f"Detailed error: {traceback.format_exc()}")
+
+            if schedules is None:
+                schedules = cached_artifact(st.session_state, "schedule_topics", parsed_text)
+            if schedules:
+                layout = (start_date, schedules)
+                schedule_data = cached_artifact(st.session_state, "schedule_data", layout,
+                                                layout_schedule, schedules, start_date)
+                weeks_used = sum(len(weeks) for weeks in schedule_data.values())
+                if weeks_used > total_weeks:
+                    st.warning(f"The schedule runs {weeks_used} weeks, longer than the {total_weeks} weeks set.")
+
+                # Create visualization
+                fig = cached_artifact(st.session_state, "schedule_chart", layout,
+                                      create_calendar_view, schedule_data, start_date)
+                if fig:
+                    st.plotly_chart(fig, use_container_width=True)
+                
+                # Display schedule details
+                st.subheader("Detailed Schedule")
+                for module, weeks in schedule_data.items():
+                    with st.expander(f"{module}"):
+                        for week, details in weeks.items():
+                            st.markdown(f"#### {week} ({details['dates']})")
+                            st.markdown("**Topics:**")
+                            for topic in details['topics']:
+                                st.markdown(f"- {topic}")
+                            st.markdown("**Activities:**")
+                            for activity in details['activities']:
+                                st.markdown(f"- {activity}")
+                            st.markdown("**Learning Objectives:**")
+                            for objective in details['objectives']:
+                                st.markdown(f"- {objective}")
+                
+                # Export: every format is rendered from the same schedule and cached by its hash
+                title = f"{os.path.splitext(uploaded_file.name)[0]} Schedule"
+                export_format = st.selectbox("Export format", list(EXPORT_FORMATS),
+                                             format_func=lambda fmt: EXPORT_LABELS[fmt])
+                st.download_button(
+                    label=f"Download Schedule {EXPORT_LABELS[export_format]}",
+                    data=export_schedule(schedule_data, export_format, title),
+                    file_name=export_filename(title, export_format),
+                    mime=EXPORT_FORMATS[export_format][2]
+                )
                         
         except Exception as e:
             st.error(f"Error processing PDF: {str(e)}")
             st.error(f"Detailed error: {traceback.format_exc()}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    st.set_page_config(page_title="Course Schedule Generator", layout="wide")
+    page_run = begin_page(st.session_state, "WeekWiseSchedule")
+    try:
+        main()
+    finally:
+        end_page(page_run)
+    start_warmup()
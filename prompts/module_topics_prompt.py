@@ -0,0 +1,7 @@
+MODULE_TOPICS_PROMPT = """Return a JSON object that maps each of the following module names to a list of its topics, using exactly these module names as keys:
+{modules}
+
+Take the topics only from these syllabus excerpts:
+{excerpts}
+
+Return just the JSON object, nothing else."""
@@ -0,0 +1,10 @@
+OUTLINE_REQUEST_PROMPT = """Generate a complete course outline for the following course. Strictly use only these inputs and mention each of them in the outline:
+
+1) Course Name: {course_name}
+2) Target Audience Edu Level: {target_audience_edu_level}
+3) Course Difficulty Level: {difficulty_level}
+4) No. of Modules: {num_modules}
+5) Course Duration: {course_duration}
+6) Course Credit: {course_credit}
+
+The outline must contain exactly {num_modules} modules, with lecture hours that add up to the given course duration. Pitch the objectives, outcomes and subtopics at a {difficulty_level} level for {target_audience_edu_level} students. If the course name is gibberish or not a real subject, say so instead of generating an outline."""
@@ -0,0 +1,22 @@
+SCHEDULE_BATCH_PROMPT = """Create a detailed week-by-week schedule for each of the following modules:
+{modules}
+
+Format your response as one JSON object keyed by exactly these module names, where each value is that module's schedule with the following structure:
+{{
+    "<module name>": {{
+        "Week 1": {{
+            "dates": "YYYY-MM-DD - YYYY-MM-DD",
+            "topics": ["topic1", "topic2"],
+            "activities": ["activity1", "activity2"],
+            "objectives": ["objective1", "objective2"]
+        }}
+    }}
+}}
+Start each module's weeks on its own start date. Ensure all dates are in YYYY-MM-DD format.
+Return just the JSON object, nothing else."""
+
+SCHEDULE_BATCH_MODULE = """
+Module: {module}
+Module Content: {content}
+Hours allocated: {hours}
+Starting from: {start_date}"""
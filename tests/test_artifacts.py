@@ -0,0 +1,86 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from utils import artifacts
+from utils.artifacts import ArtifactHandle, get_artifact, has_artifact, put_artifact, session_memory
+
+
+@pytest.fixture
+def clock(monkeypatch, tmp_path):
+    """Give the store an empty ARTIFACT_DIR and a clock the test moves by hand."""
+    now = [10000.0]
+    monkeypatch.setattr(artifacts, "time", SimpleNamespace(time=lambda: now[0]))
+    monkeypatch.setattr(artifacts, "ARTIFACT_DIR", str(tmp_path))
+    monkeypatch.setattr(artifacts, "ARTIFACT_MEMORY_LIMIT", 10 ** 6)
+    monkeypatch.setattr(artifacts, "ARTIFACT_SPILL_BYTES", 10 ** 5)
+    monkeypatch.setattr(artifacts, "ARTIFACT_IDLE_SECONDS", 100)
+    monkeypatch.setattr(artifacts, "ARTIFACT_DELETE_SECONDS", 1000)
+    monkeypatch.setattr(artifacts, "_sessions", {})
+    monkeypatch.setattr(artifacts, "_memory", 0)
+    monkeypatch.setattr(artifacts, "_swept", 0.0)
+    return now
+
+
+def test_large_artifacts_go_straight_to_disk(clock):
+    state = {}
+    put_artifact(state, "pdf", "x" * 200000)
+    assert isinstance(state["pdf"], ArtifactHandle)
+    in_memory, on_disk = session_memory(state)
+    assert in_memory == 0 and on_disk > 200000
+    assert get_artifact(state, "pdf") == "x" * 200000
+    # Too large to keep in memory once read back
+    assert session_memory(state)[0] == 0
+
+
+def test_spilled_artifacts_are_reloaded(clock, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_MEMORY_LIMIT", 120000)
+    state = {}
+    put_artifact(state, "old", "a" * 60000)
+    clock[0] += 1
+    put_artifact(state, "new", "b" * 60000)
+    assert session_memory(state)[0] < 120000
+    clock[0] += 1
+    assert get_artifact(state, "old") == "a" * 60000
+    assert artifacts._sessions[state["artifact_session"]]["old"]["value"] == "a" * 60000
+    assert artifacts._sessions[state["artifact_session"]]["new"]["value"] is artifacts._ON_DISK
+    assert get_artifact(state, "new") == "b" * 60000
+
+
+def test_idle_sessions_spill_first(clock, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_MEMORY_LIMIT", 170000)
+    active, idle = {}, {}
+    put_artifact(active, "oldest", "a" * 60000)
+    clock[0] += 10
+    put_artifact(idle, "outline", "b" * 60000)
+    clock[0] += 500
+    put_artifact(active, "newest", "c" * 60000)
+    # The idle session's artifact goes although the active one holds an older artifact
+    assert session_memory(idle)[0] == 0
+    assert session_memory(active)[1] == 0
+    assert get_artifact(idle, "outline") == "b" * 60000
+
+
+def test_abandoned_sessions_are_deleted(clock):
+    abandoned, active = {}, {}
+    put_artifact(abandoned, "pdf", "x" * 200000)
+    directory = os.path.join(artifacts.ARTIFACT_DIR, abandoned["artifact_session"])
+    assert os.path.isdir(directory)
+    clock[0] += 2000
+    put_artifact(active, "outline", "text")
+    assert not os.path.exists(directory)
+    assert not has_artifact(abandoned, "pdf")
+    assert "pdf" not in abandoned
+    assert get_artifact(active, "outline") == "text"
+
+
+def test_directories_left_by_an_earlier_process_are_swept(clock):
+    old = os.path.join(artifacts.ARTIFACT_DIR, "old-session")
+    recent = os.path.join(artifacts.ARTIFACT_DIR, "recent-session")
+    for directory, age in ((old, 5000), (recent, 10)):
+        os.makedirs(directory)
+        os.utime(directory, (clock[0] - age, clock[0] - age))
+    put_artifact({}, "outline", "text")
+    assert not os.path.exists(old)
+    assert os.path.exists(recent)
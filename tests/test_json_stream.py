@@ -0,0 +1,76 @@
+from utils.json_stream import JSONStreamParser, parse_json_response, repair_json, stream_json_entries
+
+
+def test_valid_json_keeps_curly_quotes_in_values():
+    assert repair_json('{"a": "The “best” approach"}') == {"a": "The “best” approach"}
+    assert parse_json_response('{"a": "The “best” approach", "b": 1}') == {"a": "The “best” approach", "b": 1}
+
+
+def test_curly_quotes_as_delimiters():
+    assert repair_json('{“a”: “b”}') == {"a": "b"}
+
+
+def test_curly_quotes_inside_strings_survive_other_repairs():
+    assert repair_json('{"a": "It’s “fine”", "b": [1, 2,],}') == {"a": "It’s “fine”", "b": [1, 2]}
+
+
+def test_code_fences():
+    assert repair_json('```json\n{"a": 1}\n```') == {"a": 1}
+
+
+def test_trailing_commas_outside_strings_only():
+    assert repair_json('{"a": [1, 2,], "b": "x,]",}') == {"a": [1, 2], "b": "x,]"}
+
+
+def test_python_dict_literal():
+    assert repair_json("{'a': ['x', 'y'], 'b': None}") == {"a": ["x", "y"], "b": None}
+
+
+def test_json_literals_in_single_quoted_dict():
+    assert repair_json("{'a': true, 'b': null, 'c': 'true'}") == {"a": True, "b": None, "c": "true"}
+
+
+def test_truncated_response_is_closed():
+    assert repair_json('{"a": {"b": [1, 2') == {"a": {"b": [1, 2]}}
+    assert repair_json('{"a": "unfinished') == {"a": "unfinished"}
+
+
+def test_unparsable_text():
+    assert repair_json("no json here") is None
+    assert parse_json_response("no json here") is None
+
+
+def test_stream_yields_entries_as_they_close():
+    parser = JSONStreamParser()
+    assert parser.feed('Here you go:\n{"Week 1": {"topics": ["a", "b"]}, "Week') == [("Week 1", {"topics": ["a", "b"]})]
+    assert parser.feed(' 2": {"topics": ["c"]}}') == [("Week 2", {"topics": ["c"]})]
+    assert parser.close() == []
+    assert parser.result == {"Week 1": {"topics": ["a", "b"]}, "Week 2": {"topics": ["c"]}}
+
+
+def test_stream_salvages_truncated_last_entry():
+    entries = list(stream_json_entries(['{"a": 1, "b": "trunc', "ated"]))
+    assert entries == [("a", 1), ("b", "truncated")]
+
+
+def test_stream_skips_malformed_entry():
+    parser = JSONStreamParser()
+    entries = parser.feed('{"a": 1, "b": ???, "c": 3}')
+    assert entries == [("a", 1), ("c", 3)]
+    assert parser.errors == ['"b": ???']
+
+
+def test_parser_splits_entries_outside_curly_quoted_strings():
+    assert parse_json_response('{“a”: “x, y”, “b”: 1}') == {"a": "x, y", "b": 1}
+    entries = list(stream_json_entries(['{“Week 1”: {“topics”: [“a, b”', ', “c”]}, “Week 2”: {}}']))
+    assert entries == [("Week 1", {"topics": ["a, b", "c"]}), ("Week 2", {})]
+
+
+def test_top_level_array_is_not_parsed():
+    assert parse_json_response('[{"a": 1}, {"b": 2}]') is None
+    assert parse_json_response('```json\n[\n  {"a": 1}\n]\n```') is None
+    assert list(stream_json_entries(["[", ' {"a": 1}]'])) == []
+
+
+def test_bracket_in_prose_before_object():
+    assert parse_json_response('Schedule [draft]: {"a": 1}') == {"a": 1}
@@ -0,0 +1,28 @@
+from utils.modules import align_modules, module_number
+
+
+def test_module_number():
+    assert module_number("Module 2: Sets") == 2
+    assert module_number("Unit IV - Graphs") == 4
+    assert module_number("Introduction") is None
+
+
+def test_align_by_number_and_title():
+    aligned, missing = align_modules(
+        {"Module 1: Intro to Sets": 3, "Logic and Proofs": 3},
+        {"Module-1 Sets": ["a"], "Logic & Proofs": ["b"]},
+    )
+    assert aligned == {"Module 1: Intro to Sets": ["a"], "Logic and Proofs": ["b"]}
+    assert missing == []
+
+
+def test_bare_module_names_are_not_matched_by_title():
+    aligned, missing = align_modules({"Module 1": 3, "Module 2": 3}, {"Module 2": ["a"], "Module 3": ["b"]})
+    assert aligned == {"Module 2": ["a"]}
+    assert missing == ["Module 1"]
+
+
+def test_different_module_numbers_are_not_matched_by_title():
+    aligned, missing = align_modules({"Module 1: Graphs": 3}, {"Module 4: Graphs": ["a"]})
+    assert aligned == {}
+    assert missing == ["Module 1: Graphs"]
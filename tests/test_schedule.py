@@ -0,0 +1,48 @@
+from datetime import date
+
+from utils import schedule
+from utils.schedule import generate_schedules, is_week, layout_schedule, pack_modules
+
+WEEK = {"dates": "2026-01-05 - 2026-01-12", "topics": ["a"], "activities": [], "objectives": []}
+
+
+def test_is_week():
+    assert is_week(WEEK)
+    assert not is_week("Adjust as needed")
+    assert not is_week({"topics": ["a"]})
+
+
+def test_layout_schedule_skips_entries_that_are_not_weeks():
+    laid_out = layout_schedule({"Module 1": {"Week 1": WEEK, "notes": "Adjust as needed", "Week 2": WEEK}},
+                               date(2026, 3, 2))
+    assert laid_out == {"Module 1": {
+        "Week 1": {**WEEK, "dates": "2026-03-02 - 2026-03-09"},
+        "Week 2": {**WEEK, "dates": "2026-03-09 - 2026-03-16"},
+    }}
+
+
+def test_pack_modules_respects_budget():
+    modules = [(f"Module {i}", ["topic"], 3.0, date(2026, 1, 5)) for i in range(6)]
+    assert [len(batch) for batch in pack_modules(modules, budget=100000)] == [6]
+    assert [len(batch) for batch in pack_modules(modules, budget=1)] == [1] * 6
+
+
+def test_batch_failure_falls_back_per_module(monkeypatch):
+    class FailingChat:
+        def __init__(self, task):
+            pass
+
+        def send_message(self, prompt, stream=False):
+            raise ConnectionError("offline")
+
+    monkeypatch.setattr(schedule, "LazyChat", FailingChat)
+    modules = [("Module 1", ["a"], 3.0, date(2026, 1, 5)), ("Module 2", ["b"], 3.0, date(2026, 1, 12))]
+    fallback_calls = []
+
+    def fallback(module, content, hours, start_date):
+        fallback_calls.append(module)
+        return {"Week 1": WEEK}
+
+    assert generate_schedules(modules, fallback, budget=100000) == {"Module 1": {"Week 1": WEEK},
+                                                                    "Module 2": {"Week 1": WEEK}}
+    assert fallback_calls == ["Module 1", "Module 2"]
@@ -0,0 +1,43 @@
+import io
+
+from utils.syllabus import extract_syllabus_text, score_page
+
+
+def _pdf(pages):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.set_font("Arial", "", 12)
+    for text in pages:
+        pdf.add_page()
+        pdf.multi_cell(0, 10, text)
+    return io.BytesIO(pdf.output(dest="S").encode("latin1"))
+
+
+def test_score_page():
+    score, sections = score_page("Module 1: Foundations - 6 hours\nTextbooks")
+    assert score > 0
+    assert {"modules", "hours", "books"} <= sections
+    assert score_page("Appendix: grading rubric") == (0, set())
+
+
+def test_low_scoring_page_between_relevant_pages_is_kept():
+    pages = [
+        "Module 1: Foundations - 6 hours\nModule 2: Programming - 6 hours\nModule 3: Data",
+        "Lists\nDictionaries",
+        "Module 4: Networks - 3 hours",
+        "Textbooks: Computing Basics, A. Author",
+        "Appendix A: Grading rubric",
+        "Appendix B: Lab safety",
+        "Module 9: Unrelated reference material",
+    ]
+    text, used, count = extract_syllabus_text(_pdf(pages))
+    assert "Dictionaries" in text
+    assert "Appendix" not in text and "Module 9" not in text
+    assert (used, count) == (4, 7)
+
+
+def test_falls_back_to_every_page():
+    text, used, count = extract_syllabus_text(_pdf(["Welcome", "Nothing relevant here"]))
+    assert "Welcome" in text and "Nothing relevant" in text
+    assert (used, count) == (2, 2)
@@ -0,0 +1,100 @@
+"""Cold-start benchmark for the app's pages.
+
+Renders each page once in a fresh interpreter (via Streamlit's app-testing API),
+with the import warm-up disabled, and fails if a render takes longer than the
+budget or pulls in a dependency that should only load when it is used.
+
+Usage:
+    python -m tools.cold_start_benchmark [--budget 0.5] [--runs 3]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRIPTS = [
+    "home.py",
+    "pages/PromptBasedCourse.py",
+    "pages/PDFBasedCourse.py",
+    "pages/WeekWiseSchedule.py",
+]
+
+# Dependencies that must not be imported by a first render.
+LAZY_MODULES = [
+    "google.generativeai",
+    "pandas",
+    "plotly",
+    "PyPDF2",
+    "fpdf",
+    "icalendar",
+]
+
+# Seconds a first render may take, excluding the import of Streamlit itself.
+COLD_START_BUDGET_SECONDS = 0.5
+
+_RENDER_SCRIPT = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+before = set(sys.modules)
+started = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=60).run()
+elapsed = time.perf_counter() - started
+loaded = sorted(set(sys.modules) - before)
+print(json.dumps({
+    "seconds": elapsed,
+    "loaded": loaded,
+    "exception": [e.value for e in at.exception],
+}))
+"""
+
+
+def render_once(script):
+    """Render a script in a fresh interpreter and return its measurements."""
+    env = dict(os.environ, WARMUP_IMPORTS="0", PYTHONPATH=REPO_ROOT)
+    with tempfile.TemporaryDirectory() as workdir:
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", _RENDER_SCRIPT, os.path.join(REPO_ROOT, script)],
+            cwd=workdir, env=env, capture_output=True, text=True, check=True,
+        )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start render time of each page.")
+    parser.add_argument("--budget", type=float, default=COLD_START_BUDGET_SECONDS)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    failures = []
+    for script in SCRIPTS:
+        runs = [render_once(script) for _ in range(args.runs)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        eager = [
+            lazy for lazy in LAZY_MODULES
+            if any(name == lazy or name.startswith(lazy + ".") for run in runs for name in run["loaded"])
+        ]
+        errors = runs[0]["exception"]
+
+        print(f"{script:<30} {seconds:6.3f}s  eager: {', '.join(eager) or '-'}")
+        if seconds > args.budget:
+            failures.append(f"{script} took {seconds:.3f}s (budget {args.budget:.3f}s)")
+        if eager:
+            failures.append(f"{script} imported {', '.join(eager)} on first render")
+        if errors:
+            failures.append(f"{script} raised {errors}")
+
+    if failures:
+        print("\nCold-start regression:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
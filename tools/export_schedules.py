@@ -0,0 +1,48 @@
+"""Bulk export of course schedules.
+
+Renders every schedule JSON file (as stored by the Week-Wise Schedule page's
+JSON export, or a plain {module: {week: details}} mapping) in the chosen
+formats in one pass and writes them to a single ZIP archive.
+
+Usage:
+    python -m tools.export_schedules schedules/*.json --formats pdf ical csv --out exports.zip
+"""
+import argparse
+import json
+import os
+
+from utils.export import EXPORT_FORMATS, export_schedules
+
+
+def load_schedule(path):
+    """Return (title, schedule data) from a schedule file, accepting the JSON export's own layout."""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    if isinstance(data, dict) and "rows" in data:
+        schedule = {}
+        for row in data["rows"]:
+            schedule.setdefault(row["module"], {})[row["week"]] = {
+                "dates": row["dates"],
+                "topics": row["topics"],
+                "activities": row["activities"],
+                "objectives": row["objectives"],
+            }
+        return data.get("title") or os.path.splitext(os.path.basename(path))[0], schedule
+    return os.path.splitext(os.path.basename(path))[0], data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export many course schedules in one pass.")
+    parser.add_argument("files", nargs="+", help="schedule JSON files, one per course")
+    parser.add_argument("--formats", nargs="+", default=list(EXPORT_FORMATS), choices=list(EXPORT_FORMATS))
+    parser.add_argument("--out", default="schedules.zip", help="ZIP archive to write")
+    args = parser.parse_args()
+
+    schedules = dict(load_schedule(path) for path in args.files)
+    with open(args.out, "wb") as f:
+        f.write(export_schedules(schedules, args.formats))
+    print(f"Exported {len(schedules)} schedules as {', '.join(args.formats)} to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""Concurrent-session load test for the app's pages.
+
+Drives scripted sessions through the course pages with Streamlit's app-testing
+API, in one process, against the local fake model (LLM_PROVIDER=fake), and
+reports page latency percentiles, throughput and memory per session. RSS
+growth includes the app-testing harness itself, so treat it as an upper bound.
+
+Usage:
+    python -m tools.load_test --sessions 30 --concurrency 10 --latency 0.5
+"""
+import argparse
+import contextlib
+import os
+import pickle
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _find(at, element_type, label):
+    """Return the first widget of a type whose label starts with label."""
+    def walk(node):
+        yield node
+        for child in getattr(node, "children", {}).values():
+            yield from walk(child)
+
+    for root in (at.main, at.sidebar):
+        for node in walk(root):
+            if type(node).__name__ == element_type and getattr(node, "label", "").startswith(label):
+                return node
+    raise LookupError(f"No {element_type} labelled {label!r}")
+
+
+def _share_app_test_runtime(scripts):
+    """Let AppTest sessions run concurrently in threads.
+
+    Each AppTest run installs its own mock Runtime singleton and patches the
+    config for the duration of the run, then resets both, which races when
+    runs overlap. Pin the first runtime for the rest of the process (a real
+    server also shares one runtime across sessions) and apply the config
+    override once. Each run also compiles the page into a cache of its own,
+    and concurrent compiles can fail inside ast.parse, so compile every
+    script once here and share that cache, as a real server does.
+    """
+    from streamlit import config
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.testing.v1 import app_test, local_script_runner
+    from streamlit.testing.v1.util import build_mock_config_get_option
+
+    shared = {}
+    Runtime.instance = classmethod(lambda cls: shared.setdefault("runtime", cls._instance))
+    Runtime.exists = classmethod(lambda cls: True)
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+    app_test.patch_config_options = lambda overrides: contextlib.nullcontext()
+
+    script_cache = ScriptCache()
+    for script in scripts:
+        script_cache.get_bytecode(os.path.join(REPO_ROOT, script))
+    app_test.ScriptCache = local_script_runner.ScriptCache = lambda: script_cache
+
+
+def _syllabus_pdf():
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "", 12)
+    pdf.multi_cell(0, 10, "CS101 Introduction to Computing\n\nModule 1: Foundations - 6 hours\n"
+                          "Module 2: Programming - 6 hours\nModule 3: Data - 3 hours\n\n"
+                          "Textbook: Computing Basics, A. Author")
+    return pdf.output(dest="S").encode("latin1")
+
+
+def prompt_session(at, pdf_bytes):
+    yield "render", lambda: at.run()
+    yield "course details", lambda: _find(at, "TextInput", "Course Name").input("Intro to Computing").run()
+    yield "generate outline", lambda: _find(at, "Button", "Generate Course Outline").click().run()
+    yield "complete course", lambda: _find(at, "Button", "Looks cool").click().run()
+
+
+def pdf_session(at, pdf_bytes):
+    yield "render", lambda: at.run()
+    yield "upload", lambda: at.file_uploader[0].set_value(("syllabus.pdf", pdf_bytes, "application/pdf")).run()
+    yield "format", lambda: _find(at, "Button", "Format The PDF").click().run()
+    yield "modify syllabus", lambda: _find(at, "Button", "Modify Syllabus").click().run()
+
+
+def schedule_session(at, pdf_bytes):
+    yield "render", lambda: at.run()
+    yield "upload", lambda: at.file_uploader[0].set_value(("syllabus.pdf", pdf_bytes, "application/pdf")).run()
+    yield "generate schedule", lambda: _find(at, "Button", "Generate Schedule").click().run()
+
+
+SCENARIOS = {
+    "prompt": ("pages/PromptBasedCourse.py", prompt_session),
+    "pdf": ("pages/PDFBasedCourse.py", pdf_session),
+    "schedule": ("pages/WeekWiseSchedule.py", schedule_session),
+}
+
+
+def _state_size(at):
+    """Approximate bytes held for a session: st.session_state plus its artifact store entries."""
+    from utils.artifacts import session_memory
+
+    size = sum(session_memory(at.session_state))
+    for key in list(at.session_state):
+        try:
+            size += len(pickle.dumps(at.session_state[key]))
+        except Exception:
+            continue
+    return size
+
+
+def _rss_bytes():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_session(scenario, pdf_bytes, timeout):
+    """Run one scripted session and return its step timings, state size and errors."""
+    from streamlit.testing.v1 import AppTest
+
+    script, steps = SCENARIOS[scenario]
+    at = AppTest.from_file(os.path.join(REPO_ROOT, script), default_timeout=timeout)
+    timings = []
+    errors = []
+    for step, action in steps(at, pdf_bytes):
+        started = time.perf_counter()
+        try:
+            action()
+        except Exception as e:
+            errors.append(f"{scenario}/{step}: {e}")
+            break
+        timings.append((scenario, step, time.perf_counter() - started))
+        if at.exception:
+            errors.append(f"{scenario}/{step}: {at.exception[0].value}")
+            break
+        # A script that failed to compile or run renders nothing, without an exception element
+        if not at.main.children:
+            errors.append(f"{scenario}/{step}: page rendered no elements")
+            break
+    return timings, _state_size(at), errors, at
+
+
+def _percentiles(samples):
+    if len(samples) == 1:
+        return samples[0], samples[0], samples[0]
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49], cuts[94], cuts[98]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the course pages with concurrent sessions.")
+    parser.add_argument("--sessions", type=int, default=30, help="total scripted sessions")
+    parser.add_argument("--concurrency", type=int, default=10, help="sessions running at once")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake model latency per call (s)")
+    parser.add_argument("--jitter", type=float, default=0.1, help="random +/- latency (s)")
+    parser.add_argument("--pages", nargs="+", default=list(SCENARIOS), choices=list(SCENARIOS))
+    parser.add_argument("--timeout", type=float, default=120, help="per-step timeout (s)")
+    args = parser.parse_args()
+
+    os.environ.update({
+        "LLM_PROVIDER": "fake",
+        "FAKE_MODEL_LATENCY": str(args.latency),
+        "FAKE_MODEL_JITTER": str(args.jitter),
+        "WARMUP_IMPORTS": "0",
+        "STREAMLIT_LOGGER_LEVEL": "error",
+    })
+    sys.path.insert(0, REPO_ROOT)
+    # Pages write chat history and PDFs to the working directory
+    os.chdir(tempfile.mkdtemp(prefix="load_test_"))
+
+    pdf_bytes = _syllabus_pdf()
+    scenarios = [args.pages[i % len(args.pages)] for i in range(args.sessions)]
+
+    # Warm the imports once so the first sessions do not measure module loading,
+    # and keep the runtime this first session creates for all the others
+    run_session(args.pages[0], pdf_bytes, args.timeout)
+    _share_app_test_runtime(SCENARIOS[scenario][0] for scenario in args.pages)
+
+    # Keep finished sessions alive so their memory is still counted at the end
+    finished = []
+    finished_lock = threading.Lock()
+
+    def run(scenario):
+        try:
+            result = run_session(scenario, pdf_bytes, args.timeout)
+        except Exception:
+            return [], 0, [f"{scenario}: {traceback.format_exc(limit=1)}"]
+        with finished_lock:
+            finished.append(result[3])
+        return result[:3]
+
+    rss_before = _rss_bytes()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(pool.map(run, scenarios))
+    elapsed = time.perf_counter() - started
+    rss_after = _rss_bytes()
+
+    timings = [timing for result in results for timing in result[0]]
+    state_sizes = [result[1] for result in results]
+    errors = [error for result in results for error in result[2]]
+
+    print(f"{args.sessions} sessions, concurrency {args.concurrency}, fake latency {args.latency}s, {elapsed:.1f}s wall\n")
+    print(f"{'page / step':<32} {'n':>4} {'p50':>7} {'p95':>7} {'p99':>7}")
+    for scenario in args.pages:
+        steps = dict.fromkeys(step for name, step, _ in timings if name == scenario)
+        for step in steps:
+            samples = [seconds for name, s, seconds in timings if name == scenario and s == step]
+            p50, p95, p99 = _percentiles(samples)
+            print(f"{scenario + ' / ' + step:<32} {len(samples):>4} {p50:>6.2f}s {p95:>6.2f}s {p99:>6.2f}s")
+
+    if timings:
+        p50, p95, p99 = _percentiles([seconds for _, _, seconds in timings])
+        print(f"{'all steps':<32} {len(timings):>4} {p50:>6.2f}s {p95:>6.2f}s {p99:>6.2f}s")
+
+    completed = sum(1 for result in results if not result[2])
+    print(f"\nthroughput: {completed / elapsed:.2f} sessions/s, {len(timings) / elapsed:.2f} page runs/s")
+    print(f"memory: {(rss_after - rss_before) / max(1, args.sessions) / 1024:.0f} KiB RSS growth per session, "
+          f"{statistics.mean(state_sizes) / 1024:.1f} KiB session state per session (mean)")
+
+    from utils.metrics import call_summary
+
+    print("\nmodel calls:")
+    for row in call_summary():
+        route = f"{row['provider']}:{row['model']}"
+        print(f"  {row['task']:<12} {route:<28} {row['calls']:>5} calls, {row['seconds']:.2f}s mean")
+
+    if errors:
+        print(f"\n{len(errors)} errors:")
+        for error in errors[:20]:
+            print(f"  {error}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""A/B harness for the Prompter and fast outline paths.
+
+Usage:
+    python -m tools.outline_ab --course-name "Machine Learning" --runs 3
+"""
+import argparse
+import statistics
+
+from dotenv import load_dotenv
+
+from utils.llm import get_model
+from utils.outline import compare_outline_paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare outline generation paths.")
+    parser.add_argument("--course-name", default="Introduction to Machine Learning")
+    parser.add_argument("--edu-level", default="Bachelors", choices=["Bachelors", "Masters"])
+    parser.add_argument("--difficulty", default="Intermediate", choices=["Beginner", "Intermediate", "Advanced"])
+    parser.add_argument("--modules", type=int, default=5)
+    parser.add_argument("--duration", default="45 hours")
+    parser.add_argument("--credit", default="3")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    load_dotenv()
+    model = get_model("outline")
+
+    course_details = {
+        "course_name": args.course_name,
+        "target_audience_edu_level": args.edu_level,
+        "difficulty_level": args.difficulty,
+        "num_modules": args.modules,
+        "course_duration": args.duration,
+        "course_credit": args.credit,
+    }
+    results = compare_outline_paths(model, course_details, runs=args.runs)
+
+    print(f"{'run':>3}  {'path':<8} {'latency':>8} {'tokens':>7} {'modules':>7} {'sections':>8} {'subtopics':>9}")
+    for row in results:
+        print(f"{row['run']:>3}  {row['path']:<8} {row['latency']:>8} {row['tokens']:>7} "
+              f"{row['modules']:>7} {row['sections']:>8} {row['subtopics']:>9}")
+
+    print()
+    for path in ("prompter", "fast"):
+        rows = [row for row in results if row["path"] == path]
+        print(f"{path:<8} median latency {statistics.median(r['latency'] for r in rows):.2f}s, "
+              f"median tokens {statistics.median(r['tokens'] for r in rows):.0f}, "
+              f"modules {[r['modules'] for r in rows]} (requested {args.modules})")
+
+
+if __name__ == "__main__":
+    main()
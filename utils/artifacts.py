@@ -0,0 +1,264 @@
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+# Memory all sessions' artifacts may use before the least recently used ones spill to disk.
+ARTIFACT_MEMORY_LIMIT = int(float(os.getenv("ARTIFACT_MEMORY_LIMIT_MB", "256")) * 1024 * 1024)
+# Artifacts larger than this are written straight to disk and only loaded when read.
+ARTIFACT_SPILL_BYTES = int(os.getenv("ARTIFACT_SPILL_BYTES", str(256 * 1024)))
+# Sessions untouched for this long are the first spilled to disk when memory is over the limit.
+ARTIFACT_IDLE_SECONDS = int(os.getenv("ARTIFACT_IDLE_SECONDS", "1800"))
+# Sessions untouched for this long are deleted, memory and disk.
+ARTIFACT_DELETE_SECONDS = int(os.getenv("ARTIFACT_DELETE_SECONDS", str(24 * 3600)))
+ARTIFACT_DIR = os.getenv("ARTIFACT_DIR", os.path.join(tempfile.gettempdir(), "course_artifacts"))
+# How often ARTIFACT_DIR is checked for directories no live session owns, e.g. after a restart
+_SWEEP_SECONDS = 600
+
+# Marks an artifact whose value currently lives only on disk
+_ON_DISK = object()
+
+_sessions = {}
+_memory = 0
+_swept = 0.0
+_lock = threading.RLock()
+
+
+class ArtifactHandle:
+    """Small placeholder kept in st.session_state in place of a large value."""
+
+    __slots__ = ("name", "size")
+
+    def __init__(self, name, size):
+        self.name = name
+        self.size = size
+
+    def __repr__(self):
+        return f"ArtifactHandle({self.name!r}, {self.size} bytes)"
+
+    def __getstate__(self):
+        return (self.name, self.size)
+
+    def __setstate__(self, state):
+        self.name, self.size = state
+
+
+def _size(value):
+    if isinstance(value, (str, bytes)):
+        return sys.getsizeof(value)
+    try:
+        return len(pickle.dumps(value))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+def _session_id(state):
+    if "artifact_session" not in state:
+        state["artifact_session"] = uuid.uuid4().hex
+    return state["artifact_session"]
+
+
+def _path(session_id, name):
+    return os.path.join(ARTIFACT_DIR, session_id, f"{uuid.uuid5(uuid.NAMESPACE_OID, name).hex}.pkl")
+
+
+def _spill(session_id, name, entry):
+    global _memory
+    if entry["value"] is _ON_DISK:
+        return
+    path = _path(session_id, name)
+    if not entry["on_disk"]:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(entry["value"], f)
+        entry["on_disk"] = True
+    entry["value"] = _ON_DISK
+    _memory -= entry["size"]
+
+
+def _drop_session(session_id):
+    global _memory
+    if session_id is None:
+        return
+    entries = _sessions.pop(session_id, {})
+    _memory -= sum(entry["size"] for entry in entries.values() if entry["value"] is not _ON_DISK)
+    shutil.rmtree(os.path.join(ARTIFACT_DIR, session_id), ignore_errors=True)
+
+
+def _last_used(entries, now):
+    return max((entry["used"] for entry in entries.values()), default=now)
+
+
+def _sweep_orphans(now):
+    """Delete directories of ARTIFACT_DIR that no live session owns once they are past ARTIFACT_DELETE_SECONDS."""
+    global _swept
+    if now - _swept < _SWEEP_SECONDS:
+        return
+    _swept = now
+    try:
+        session_ids = os.listdir(ARTIFACT_DIR)
+    except OSError:
+        return
+    for session_id in session_ids:
+        path = os.path.join(ARTIFACT_DIR, session_id)
+        if session_id in _sessions or not os.path.isdir(path):
+            continue
+        try:
+            abandoned = now - os.path.getmtime(path) > ARTIFACT_DELETE_SECONDS
+        except OSError:
+            continue
+        if abandoned:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _enforce_limit(now):
+    """Delete abandoned sessions, and spill artifacts to disk while memory is over the limit.
+
+    Idle sessions are spilled whole before the least recently used artifacts
+    of active ones. Nothing is deleted until ARTIFACT_DELETE_SECONDS, including
+    the spilled files of sessions lost in a server restart.
+    """
+    for session_id, entries in list(_sessions.items()):
+        if now - _last_used(entries, now) > ARTIFACT_DELETE_SECONDS:
+            _drop_session(session_id)
+    _sweep_orphans(now)
+
+    if _memory <= ARTIFACT_MEMORY_LIMIT:
+        return
+    in_memory = sorted(
+        ((now - _last_used(entries, now) <= ARTIFACT_IDLE_SECONDS, entry["used"], session_id, name, entry)
+         for session_id, entries in _sessions.items()
+         for name, entry in entries.items()
+         if entry["value"] is not _ON_DISK),
+        key=lambda item: item[:2],
+    )
+    for _, _, session_id, name, entry in in_memory:
+        if _memory <= ARTIFACT_MEMORY_LIMIT:
+            break
+        _spill(session_id, name, entry)
+
+
+def put_artifact(state, name, value):
+    """Store a large session value outside st.session_state.
+
+    Only an ArtifactHandle is kept under name in the session state, so
+    `name in st.session_state` checks keep working.
+    """
+    global _memory
+    now = time.time()
+    size = _size(value)
+    with _lock:
+        session_id = _session_id(state)
+        entries = _sessions.setdefault(session_id, {})
+        old = entries.pop(name, None)
+        if old and old["value"] is not _ON_DISK:
+            _memory -= old["size"]
+
+        entry = {"value": value, "size": size, "used": now, "on_disk": False}
+        entries[name] = entry
+        _memory += size
+        if size > ARTIFACT_SPILL_BYTES:
+            _spill(session_id, name, entry)
+        _enforce_limit(now)
+    state[name] = ArtifactHandle(name, size)
+    return value
+
+
+def _forget_handle(state, name):
+    if isinstance(state.get(name), ArtifactHandle):
+        del state[name]
+
+
+def has_artifact(state, name):
+    """Return whether a value is stored under name.
+
+    Unlike `name in state`, this is False for an artifact deleted with its
+    abandoned session, whose handle is then removed from the state too.
+    """
+    with _lock:
+        found = name in _sessions.get(state.get("artifact_session"), {})
+    if not found:
+        _forget_handle(state, name)
+    return found
+
+
+def get_artifact(state, name, default=None):
+    """Return a value stored with put_artifact(), reloading it from disk if it was spilled.
+
+    Returns default, and drops the stale handle, if the artifact was deleted.
+    """
+    global _memory
+    with _lock:
+        entry = _sessions.get(state.get("artifact_session"), {}).get(name)
+        if entry is None:
+            _forget_handle(state, name)
+            return default
+        entry["used"] = time.time()
+        if entry["value"] is not _ON_DISK:
+            return entry["value"]
+
+        with open(_path(state["artifact_session"], name), "rb") as f:
+            value = pickle.load(f)
+        if entry["size"] <= ARTIFACT_SPILL_BYTES:
+            entry["value"] = value
+            _memory += entry["size"]
+            _enforce_limit(entry["used"])
+        return value
+
+
+def cached_artifact(state, name, source, compute=None, *args, refresh=False):
+    """Return the artifact stored under name if it was computed from the same source.
+
+    Otherwise, or with refresh=True, compute(*args) is called and its result,
+    unless None, is stored with a fingerprint of source, so a pipeline stage
+    only reruns when its own inputs change or when asked to. Without compute,
+    returns None when nothing matching is stored.
+    """
+    fingerprint = hashlib.sha1(str(source).encode("utf-8")).hexdigest()
+    stored = None if refresh else get_artifact(state, name)
+    if stored is not None and stored[0] == fingerprint:
+        return stored[1]
+    if compute is None:
+        return None
+    value = compute(*args)
+    if value is not None:
+        put_artifact(state, name, (fingerprint, value))
+    return value
+
+
+def drop_artifacts(state, names=None):
+    """Forget the given artifacts of a session, or all of them when names is None."""
+    global _memory
+    session_id = state.get("artifact_session")
+    with _lock:
+        if names is None:
+            _drop_session(session_id)
+        else:
+            entries = _sessions.get(session_id, {})
+            for name in names:
+                entry = entries.pop(name, None)
+                if entry and entry["value"] is not _ON_DISK:
+                    _memory -= entry["size"]
+                if entry and entry["on_disk"]:
+                    os.remove(_path(session_id, name))
+    for name in names if names is not None else list(state.keys()):
+        _forget_handle(state, name)
+
+
+def session_memory(state):
+    """Return (bytes in memory, bytes on disk) held for a session's artifacts."""
+    with _lock:
+        entries = _sessions.get(state.get("artifact_session"), {}).values()
+        in_memory = sum(entry["size"] for entry in entries if entry["value"] is not _ON_DISK)
+        on_disk = sum(entry["size"] for entry in entries if entry["value"] is _ON_DISK)
+    return in_memory, on_disk
+
+
+def total_memory():
+    """Return the bytes held in memory by all sessions' artifacts."""
+    return _memory
@@ -0,0 +1,194 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+import unicodedata
+import zipfile
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+
+from utils.tracing import traced
+
+# Rendered exports kept in memory, keyed by schedule hash and format.
+EXPORT_CACHE_ENTRIES = int(os.getenv("EXPORT_CACHE_ENTRIES", "128"))
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def schedule_hash(schedule_data, title=""):
+    """Return a stable hash of a schedule and its title."""
+    encoded = json.dumps([title, schedule_data], sort_keys=True, default=str)
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def _parse_dates(dates):
+    try:
+        start, end = (date.fromisoformat(part.strip()) for part in str(dates).split(" - "))
+        return start, end
+    except ValueError:
+        return None, None
+
+
+def _as_list(value):
+    if value is None:
+        return []
+    return [str(item) for item in value] if isinstance(value, list) else [str(value)]
+
+
+def schedule_document(schedule_data, title="Course Schedule"):
+    """Flatten a schedule into the rows every export format is rendered from.
+
+    Each row is one week of one module, with its dates parsed where possible.
+    """
+    rows = []
+    for module, weeks in schedule_data.items():
+        for week, details in weeks.items():
+            details = details if isinstance(details, dict) else {}
+            start, end = _parse_dates(details.get("dates", ""))
+            rows.append({
+                "module": module,
+                "week": week,
+                "dates": details.get("dates", ""),
+                "start": start,
+                "end": end,
+                "topics": _as_list(details.get("topics")),
+                "activities": _as_list(details.get("activities")),
+                "objectives": _as_list(details.get("objectives")),
+            })
+    return {"title": title, "rows": rows}
+
+
+def _ascii(text):
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+
+
+@traced("generate_pdf")
+def render_pdf(document):
+    from fpdf import FPDF
+
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", "B", 14)
+    pdf.multi_cell(0, 10, _ascii(document["title"]))
+    module = None
+    for row in document["rows"]:
+        if row["module"] != module:
+            module = row["module"]
+            pdf.set_font("Arial", "B", 12)
+            pdf.multi_cell(0, 10, _ascii(module))
+        pdf.set_font("Arial", "B", 12)
+        pdf.multi_cell(0, 10, _ascii(f"{row['week']} ({row['dates']})"))
+        pdf.set_font("Arial", "", 12)
+        for heading in ("topics", "activities", "objectives"):
+            lines = "\n".join(f"- {item}" for item in row[heading])
+            pdf.multi_cell(0, 10, _ascii(f"{heading.capitalize()}:\n{lines}"))
+    return pdf.output(dest="S").encode("latin1")
+
+
+@traced("export ical")
+def render_ical(document):
+    from icalendar import Calendar, Event
+
+    calendar = Calendar()
+    calendar.add("prodid", "-//Automated Course Content Generator//Course Schedule//EN")
+    calendar.add("version", "2.0")
+    calendar.add("x-wr-calname", document["title"])
+    stamp = datetime.now(timezone.utc)
+    for row in document["rows"]:
+        if row["start"] is None:
+            continue
+        event = Event()
+        uid = hashlib.sha1(f"{document['title']}|{row['module']}|{row['week']}".encode("utf-8")).hexdigest()
+        event.add("uid", f"{uid}@course-schedule")
+        event.add("dtstamp", stamp)
+        event.add("summary", f"{row['module']}: {row['week']}")
+        event.add("dtstart", row["start"])
+        # All-day DTEND is exclusive, like the end of a week's date range
+        event.add("dtend", row["end"] if row["end"] and row["end"] > row["start"] else row["start"])
+        event.add("description", "\n".join(
+            f"{heading.capitalize()}: {'; '.join(row[heading])}" for heading in ("topics", "activities", "objectives")
+        ))
+        calendar.add_component(event)
+    return calendar.to_ical()
+
+
+@traced("export csv")
+def render_csv(document):
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(["module", "week", "start", "end", "topics", "activities", "objectives"])
+    for row in document["rows"]:
+        writer.writerow([
+            row["module"], row["week"], row["start"] or "", row["end"] or "",
+            "; ".join(row["topics"]), "; ".join(row["activities"]), "; ".join(row["objectives"]),
+        ])
+    return output.getvalue().encode("utf-8")
+
+
+@traced("export json")
+def render_json(document):
+    return json.dumps(document, indent=2, default=str).encode("utf-8")
+
+
+# Format name: (renderer, file extension, MIME type)
+EXPORT_FORMATS = {
+    "pdf": (render_pdf, "pdf", "application/pdf"),
+    "ical": (render_ical, "ics", "text/calendar"),
+    "csv": (render_csv, "csv", "text/csv"),
+    "json": (render_json, "json", "application/json"),
+}
+
+
+def export_filename(title, fmt):
+    """Return a file name for a schedule export, e.g. "cs101_schedule.ics"."""
+    stem = re.sub(r"[^a-z0-9]+", "_", title.lower()).strip("_") or "course"
+    return f"{stem}.{EXPORT_FORMATS[fmt][1]}"
+
+
+def _cached(key, render):
+    with _cache_lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    data = render()
+    with _cache_lock:
+        _cache[key] = data
+        while len(_cache) > EXPORT_CACHE_ENTRIES:
+            _cache.popitem(last=False)
+    return data
+
+
+def export_schedule(schedule_data, fmt, title="Course Schedule"):
+    """Render a schedule in one format, reusing the output of an identical earlier export."""
+    renderer = EXPORT_FORMATS[fmt][0]
+    return _cached((schedule_hash(schedule_data, title), fmt),
+                   lambda: renderer(schedule_document(schedule_data, title)))
+
+
+def export_schedules(schedules, formats=tuple(EXPORT_FORMATS)):
+    """Export many courses' schedules in one pass and return them as a ZIP archive.
+
+    schedules maps course titles to schedule data. Each schedule is hashed and
+    flattened at most once and rendered in every requested format, one file
+    per course and format.
+    """
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as bundle:
+        for title, schedule_data in schedules.items():
+            digest = schedule_hash(schedule_data, title)
+            documents = []
+
+            def document():
+                if not documents:
+                    documents.append(schedule_document(schedule_data, title))
+                return documents[0]
+
+            for fmt in formats:
+                renderer = EXPORT_FORMATS[fmt][0]
+                data = _cached((digest, fmt), lambda: renderer(document()))
+                bundle.writestr(export_filename(title, fmt), data)
+    return archive.getvalue()
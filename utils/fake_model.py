@@ -0,0 +1,142 @@
+import json
+import os
+import random
+import time
+from datetime import date, timedelta
+
+OUTLINE = """**Course Code and Course Title**: CS101 Introduction to Computing
+
+**Pre-requisite**: None
+
+**Syllabus Version**: 1.0
+
+**Total Lecture Hours**: 15
+
+**Course Objectives**:
+- Understand the basics of computing
+
+**Course Outcomes**:
+- Write simple programs
+
+**Module Structure**:
+- **Module 1: Foundations - 6 hours**
+  - History of Computing
+  - Number Systems
+  - Logic Gates
+- **Module 2: Programming - 6 hours**
+  - Variables and Types
+  - Control Flow
+  - Functions
+- **Module 3: Data - 3 hours**
+  - Lists
+  - Dictionaries
+
+**Textbooks**: Computing Basics, A. Author, 2020
+
+**Reference Books**: Programming Today, B. Author, 2021"""
+
+MODULE_LESSONS = {
+    "Module 1: Foundations": ["History of Computing", "Number Systems", "Logic Gates"],
+    "Module 2: Programming": ["Variables and Types", "Control Flow", "Functions"],
+    "Module 3: Data": ["Lists", "Dictionaries"],
+}
+
+MODULE_HOURS = {"Module 1: Foundations": "6 hours", "Module 2: Programming": "6 hours", "Module 3: Data": "3 hours"}
+
+
+def _weeks(start):
+    return {
+        f"Week {week + 1}": {
+            "dates": f"{start + timedelta(weeks=week)} - {start + timedelta(weeks=week, days=7)}",
+            "topics": [f"Topic {week + 1}.1", f"Topic {week + 1}.2"],
+            "activities": ["Lecture", "Lab"],
+            "objectives": ["Understand the topic"],
+        }
+        for week in range(2)
+    }
+
+
+def _start_date(line):
+    return date.fromisoformat(line.split(":", 1)[1].strip()[:10])
+
+
+def _week_schedule(prompt):
+    start = date.today()
+    for line in prompt.splitlines():
+        if line.strip().startswith("Starting from:"):
+            start = _start_date(line)
+    return json.dumps(_weeks(start), indent=2)
+
+
+def _batch_schedule(prompt):
+    schedules = {}
+    module = None
+    for line in prompt.splitlines():
+        if line.startswith("Module:"):
+            module = line.split(":", 1)[1].strip()
+        elif line.startswith("Starting from:") and module:
+            schedules[module] = _weeks(_start_date(line))
+    return json.dumps(schedules, indent=2)
+
+
+class FakeResponse:
+    """Stands in for a Gemini response; iterating it yields streamed chunks."""
+
+    def __init__(self, text, prompt):
+        self.text = text
+        self.usage_metadata = type("UsageMetadata", (), {
+            "prompt_token_count": len(prompt) // 4,
+            "candidates_token_count": len(text) // 4,
+            "total_token_count": (len(prompt) + len(text)) // 4,
+        })()
+
+    def __iter__(self):
+        for start in range(0, len(self.text), 40):
+            yield FakeResponse(self.text[start:start + 40], "")
+
+
+class FakeChat:
+    """Chat session that answers each prompt kind the pages send with canned output."""
+
+    def __init__(self, latency, jitter):
+        self.latency = latency
+        self.jitter = jitter
+        self._last_prompt = ""
+
+    def _answer(self, prompt):
+        if "You are DICTator" in prompt:
+            return "Understood. Send me the course outline."
+        if "You are DICTator" in self._last_prompt:
+            return repr(MODULE_LESSONS)
+        if "You are Prompter" in prompt:
+            return "Generate a detailed course outline for CS101 Introduction to Computing."
+        if "durations in hours" in prompt:
+            return json.dumps(MODULE_HOURS)
+        if "module names and their topics" in prompt or "list of its topics" in prompt:
+            return json.dumps(MODULE_LESSONS)
+        if "week-by-week schedule for each of" in prompt:
+            return f"```json\n{_batch_schedule(prompt)}\n```"
+        if "week-by-week schedule" in prompt:
+            return f"```json\n{_week_schedule(prompt)}\n```"
+        return OUTLINE
+
+    def send_message(self, prompt, stream=False, **kwargs):
+        time.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        response = FakeResponse(self._answer(prompt), prompt)
+        self._last_prompt = prompt
+        return response
+
+
+class FakeModel:
+    """Local stand-in for GenerativeModel, selected with LLM_PROVIDER=fake.
+
+    FAKE_MODEL_LATENCY and FAKE_MODEL_JITTER (seconds) set the simulated
+    response time of every message.
+    """
+
+    def __init__(self, latency=None, jitter=None):
+        self.latency = float(os.getenv("FAKE_MODEL_LATENCY", "0.5")) if latency is None else latency
+        self.jitter = float(os.getenv("FAKE_MODEL_JITTER", "0")) if jitter is None else jitter
+
+    def start_chat(self, history=None):
+        return FakeChat(self.latency, self.jitter)
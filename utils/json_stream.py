@@ -0,0 +1,188 @@
+import ast
+import json
+import re
+
+from utils.tracing import span, traced
+
+_STRING = re.compile(r'"(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\'', re.DOTALL)
+_TRAILING_COMMA = re.compile(r",(\s*[}\]])")
+_LITERALS = {"true": "True", "false": "False", "null": "None"}
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+# Opening quote -> closing quote, for the stream scanner. Models sometimes open with ” too.
+_QUOTE_PAIRS = {'"': '"', "'": "'", "“": "”", "”": "”", "‘": "’"}
+
+
+def _outside_strings(text, fix):
+    """Apply fix to the parts of text that are not inside string literals."""
+    parts = []
+    last = 0
+    for match in _STRING.finditer(text):
+        parts.append(fix(text[last:match.start()]))
+        parts.append(match.group(0))
+        last = match.end()
+    parts.append(fix(text[last:]))
+    return "".join(parts)
+
+
+def _close_open(text):
+    """Close a string and any brackets left open by a truncated response."""
+    stack = []
+    quote = None
+    escaped = False
+    for ch in text:
+        if quote:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == quote:
+                quote = None
+        elif ch in "\"'":
+            quote = ch
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+    if quote:
+        text += quote
+    text = text.rstrip().rstrip(",:")
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text):
+    """Parse a JSON object or Python dict literal, fixing common LLM formatting faults.
+
+    Handles code fences, smart quotes, single quotes, Python literals, trailing
+    commas and brackets left open by a truncated response. Returns None if the
+    text still cannot be parsed.
+    """
+    text = re.sub(r"```(?:json|python)?", "", text).strip()
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    # Curly quotes are only delimiters outside string literals; inside them they are content
+    text = _outside_strings(text, lambda part: part.translate(_SMART_QUOTES))
+    text = _close_open(text)
+    text = _outside_strings(text, lambda part: _TRAILING_COMMA.sub(r"\1", part))
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+
+    python_text = _outside_strings(
+        text, lambda part: re.sub(r"\b(true|false|null)\b", lambda m: _LITERALS[m.group(1)], part)
+    )
+    try:
+        return ast.literal_eval(python_text)
+    except (ValueError, SyntaxError):
+        return None
+
+
+class JSONStreamParser:
+    """Incrementally parse a streamed JSON object one top-level entry at a time.
+
+    Feed response chunks as they arrive; each call returns the (key, value)
+    pairs whose values closed in that chunk, so a caller can render e.g. each
+    week of a schedule as soon as the model finishes writing it. Text before
+    the opening brace (prose, code fences) is skipped, and each entry is
+    parsed with repair_json() so one malformed entry does not lose the rest.
+    Curly quotes delimit strings like straight ones. A top-level array is
+    not an object, so it yields nothing.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.result = {}
+        self.errors = []
+        self._pos = 0
+        self._depth = 0
+        self._quote = None
+        self._escaped = False
+        self._entry_start = None
+        self._closed = False
+
+    def feed(self, chunk):
+        """Consume a chunk of text and return the entries it completed."""
+        self.buffer += chunk
+        entries = []
+        while self._pos < len(self.buffer) and not self._closed:
+            ch = self.buffer[self._pos]
+            if self._entry_start is None:
+                if ch == "{":
+                    self._depth = 1
+                    self._entry_start = self._pos + 1
+                elif ch == "[":
+                    rest = self.buffer[self._pos + 1:].lstrip()
+                    if not rest:
+                        # Wait for the next chunk to tell a JSON array from a bracket in prose
+                        break
+                    if rest[0] in '{["“0123456789-':
+                        self.errors.append("top-level array instead of an object")
+                        self._closed = True
+                        break
+            elif self._quote:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == self._quote:
+                    self._quote = None
+            elif ch in _QUOTE_PAIRS:
+                self._quote = _QUOTE_PAIRS[ch]
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    entries.extend(self._take_entry(self._pos))
+                    self._closed = True
+            elif ch == "," and self._depth == 1:
+                entries.extend(self._take_entry(self._pos))
+            self._pos += 1
+        return entries
+
+    def close(self):
+        """Finish the stream, salvaging an entry left open by a truncated response."""
+        if self._entry_start is None or self._closed:
+            return []
+        self._closed = True
+        return self._take_entry(len(self.buffer), complete=False)
+
+    def _take_entry(self, end, complete=True):
+        text = self.buffer[self._entry_start:end].strip()
+        self._entry_start = end + 1
+        if not text:
+            return []
+        # repair_json() closes whatever a truncated entry left open
+        parsed = repair_json("{" + text + ("}" if complete else ""))
+        if not isinstance(parsed, dict):
+            self.errors.append(text)
+            return []
+        self.result.update(parsed)
+        return list(parsed.items())
+
+
+def stream_json_entries(chunks, parser=None):
+    """Yield (key, value) top-level entries from streamed response chunks.
+
+    chunks may be strings or streamed model responses with a .text attribute.
+    """
+    parser = parser or JSONStreamParser()
+    for chunk in chunks:
+        with span("json extraction", streamed=True):
+            entries = parser.feed(getattr(chunk, "text", chunk))
+        yield from entries
+    with span("json extraction", streamed=True):
+        entries = parser.close()
+    yield from entries
+
+
+@traced("json extraction")
+def parse_json_response(text):
+    """Parse the JSON object in a complete model response, or return None."""
+    parser = JSONStreamParser()
+    parser.feed(text)
+    parser.close()
+    return parser.result or None
@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+
+from utils.metrics import record_call, response_tokens
+from utils.tracing import add_span
+
+# Model each task is sent to, as "provider:model". "default" is the provider SDK's default
+# model. Override one task with e.g. LLM_MODEL_EXTRACTION="openai:gpt-4o-mini".
+DEFAULT_ROUTES = {
+    # Creative, long-form generation: course outlines, and outlines rewritten with the user's modifications
+    "outline": "gemini:default",
+    "content": "gemini:default",
+    # Restructuring and extraction, where a smaller, faster model is enough
+    "formatting": "gemini:gemini-1.5-flash-8b",
+    "extraction": "gemini:gemini-1.5-flash-8b",
+    "schedule": "gemini:gemini-1.5-flash-8b",
+}
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def route(task):
+    """Return the (provider, model) a task is routed to.
+
+    LLM_PROVIDER=fake sends every task to the local stand-in, for load tests.
+    """
+    if os.getenv("LLM_PROVIDER") == "fake":
+        return "fake", "default"
+    spec = os.getenv(f"LLM_MODEL_{task.upper()}") or DEFAULT_ROUTES.get(task, DEFAULT_ROUTES["outline"])
+    provider, _, model = spec.partition(":")
+    return provider, model or "default"
+
+
+def _gemini_model(name):
+    import google.generativeai as genai
+
+    genai.configure(api_key=os.getenv("API_KEY"))
+    return genai.GenerativeModel() if name == "default" else genai.GenerativeModel(name)
+
+
+def _fake_model(name):
+    from utils.fake_model import FakeModel
+
+    return FakeModel()
+
+
+class _Usage:
+    def __init__(self, total_token_count):
+        self.total_token_count = total_token_count
+
+
+class _Response:
+    def __init__(self, text, total_tokens=0):
+        self.text = text
+        self.usage_metadata = _Usage(total_tokens)
+
+
+class OpenAIChat:
+    """Chat session on the OpenAI chat completions API with the Gemini send_message interface."""
+
+    def __init__(self, client, model):
+        self.client = client
+        self.model = model
+        self.history = []
+
+    def send_message(self, prompt, stream=False, **kwargs):
+        self.history.append({"role": "user", "content": prompt})
+        if stream:
+            return self._stream()
+        completion = self.client.chat.completions.create(model=self.model, messages=self.history)
+        text = completion.choices[0].message.content or ""
+        self.history.append({"role": "assistant", "content": text})
+        usage = getattr(completion, "usage", None)
+        return _Response(text, getattr(usage, "total_tokens", 0) or 0)
+
+    def _stream(self):
+        parts = []
+        for chunk in self.client.chat.completions.create(model=self.model, messages=self.history, stream=True):
+            piece = chunk.choices[0].delta.content if chunk.choices else None
+            if piece:
+                parts.append(piece)
+                yield _Response(piece)
+        self.history.append({"role": "assistant", "content": "".join(parts)})
+
+
+class OpenAIModel:
+    """OpenAI model exposing start_chat() like GenerativeModel. Reads OPENAI_API_KEY."""
+
+    def __init__(self, name):
+        from openai import OpenAI
+
+        self.client = OpenAI()
+        self.name = "gpt-4o-mini" if name == "default" else name
+
+    def start_chat(self, history=None):
+        return OpenAIChat(self.client, self.name)
+
+
+PROVIDERS = {
+    "gemini": _gemini_model,
+    "openai": OpenAIModel,
+    "fake": _fake_model,
+}
+
+
+def get_model(task="outline"):
+    """Return the shared model for a task, importing its provider SDK on first use."""
+    provider, name = route(task)
+    with _models_lock:
+        if (provider, name) not in _models:
+            if provider not in PROVIDERS:
+                raise ValueError(f"Unknown model provider {provider!r} for task {task!r}")
+            _models[provider, name] = PROVIDERS[provider](name)
+        return _models[provider, name]
+
+
+class LazyChat:
+    """Chat session for one task that is only started when the first message is sent.
+
+    The task picks the model through route(). Pages create chats per rerun,
+    and the provider SDK is only imported and configured on the first message,
+    so a render that never calls the model does not import it at all. Every
+    call is recorded in utils.metrics with the route it took, and as a trace
+    span when tracing is on.
+    """
+
+    def __init__(self, task="outline"):
+        self.task = task
+        self._chat = None
+        self._route = None
+
+    def send_message(self, prompt, stream=False, **kwargs):
+        if self._chat is None:
+            self._route = route(self.task)
+            self._chat = get_model(self.task).start_chat(history=[])
+        started = time.perf_counter()
+        if stream:
+            return self._recorded_stream(self._chat.send_message(prompt, stream=True, **kwargs), started)
+        response = self._chat.send_message(prompt, **kwargs)
+        self._record(started, response_tokens(response))
+        return response
+
+    def _recorded_stream(self, response, started):
+        tokens = 0
+        for chunk in response:
+            # Streamed usage is cumulative, so the last chunk carries the total
+            tokens = response_tokens(chunk) or tokens
+            yield chunk
+        self._record(started, tokens, streamed=True)
+
+    def _record(self, started, tokens, streamed=False):
+        seconds = time.perf_counter() - started
+        provider, model = self._route
+        record_call(self.task, provider, model, seconds, tokens)
+        add_span(f"send_message {self.task}", started, seconds,
+                 provider=provider, model=model, tokens=tokens, streamed=streamed)
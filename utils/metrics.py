@@ -0,0 +1,50 @@
+import os
+import threading
+import time
+from collections import deque
+
+# Model calls kept for the summary, most recent first out.
+METRICS_MAX_CALLS = int(os.getenv("METRICS_MAX_CALLS", "1000"))
+
+_calls = deque(maxlen=METRICS_MAX_CALLS)
+_lock = threading.Lock()
+
+
+def response_tokens(response):
+    """Return the total token count reported for a model response, or 0."""
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "total_token_count", 0) or 0
+
+
+def record_call(task, provider, model, seconds, tokens):
+    """Record one model call with the route it took."""
+    with _lock:
+        _calls.append({
+            "time": time.time(),
+            "task": task,
+            "provider": provider,
+            "model": model,
+            "seconds": seconds,
+            "tokens": tokens,
+        })
+
+
+def call_summary():
+    """Aggregate recorded calls per task and route.
+
+    Returns one row per (task, provider, model) with the call count, mean
+    latency in seconds and total tokens.
+    """
+    with _lock:
+        calls = list(_calls)
+    rows = {}
+    for call in calls:
+        key = (call["task"], call["provider"], call["model"])
+        row = rows.setdefault(key, {"task": key[0], "provider": key[1], "model": key[2],
+                                    "calls": 0, "seconds": 0.0, "tokens": 0})
+        row["calls"] += 1
+        row["seconds"] += call["seconds"]
+        row["tokens"] += call["tokens"]
+    for row in rows.values():
+        row["seconds"] = round(row["seconds"] / row["calls"], 3)
+    return list(rows.values())
@@ -0,0 +1,98 @@
+import difflib
+import re
+
+from prompts.module_topics_prompt import MODULE_TOPICS_PROMPT
+from utils.json_stream import parse_json_response
+from utils.tracing import span
+
+_MODULE_NUMBER = re.compile(r"\b(?:module|unit)\s*[-:#]?\s*(\d+|[ivx]+)\b", re.IGNORECASE)
+_ROMAN = {"i": 1, "ii": 2, "iii": 3, "iv": 4, "v": 5, "vi": 6, "vii": 7, "viii": 8, "ix": 9, "x": 10}
+
+# Characters of syllabus text sent per missing module when re-asking for its topics.
+EXCERPT_CHARS = 1500
+
+
+def module_number(name):
+    """Return the module number in a name like "Module 2: Sets" or "Unit IV", or None."""
+    match = _MODULE_NUMBER.search(str(name))
+    if not match:
+        return None
+    number = match.group(1).lower()
+    return int(number) if number.isdigit() else _ROMAN.get(number)
+
+
+def _normalise(name):
+    name = _MODULE_NUMBER.sub(" ", str(name).lower())
+    return " ".join(re.findall(r"[a-z0-9]+", name))
+
+
+def align_modules(week_data, content_data, cutoff=0.6):
+    """Match the module names of two extractions of the same syllabus.
+
+    Returns the content keyed by the names used in week_data, and the
+    week_data modules that have no counterpart in content_data. Names match
+    exactly, then by module number, then by closest title among names that
+    do not carry a different module number.
+    """
+    aligned = {}
+    unused = dict(content_data)
+
+    for module in week_data:
+        if module in unused:
+            aligned[module] = unused.pop(module)
+
+    for module in week_data:
+        number = module_number(module)
+        if module in aligned or number is None:
+            continue
+        candidates = [key for key in unused if module_number(key) == number]
+        if len(candidates) == 1:
+            aligned[module] = unused.pop(candidates[0])
+
+    for module in week_data:
+        title = _normalise(module)
+        # A bare "Module 1" has no title to compare
+        if module in aligned or not title:
+            continue
+        number = module_number(module)
+        titles = {
+            _normalise(key): key for key in unused
+            if _normalise(key) and (number is None or module_number(key) in (None, number))
+        }
+        match = difflib.get_close_matches(title, list(titles), n=1, cutoff=cutoff)
+        if match:
+            aligned[module] = unused.pop(titles[match[0]])
+
+    missing = [module for module in week_data if module not in aligned]
+    return aligned, missing
+
+
+def syllabus_excerpt(text, module):
+    """Return the part of the syllabus text that describes a module."""
+    number = module_number(module)
+    headings = list(_MODULE_NUMBER.finditer(text))
+    for index, heading in enumerate(headings):
+        if number is not None and module_number(heading.group(0)) == number:
+            end = headings[index + 1].start() if index + 1 < len(headings) else len(text)
+            return text[heading.start():min(end, heading.start() + EXCERPT_CHARS)].strip()
+
+    lines = text.splitlines()
+    if not lines:
+        return ""
+    ratios = [difflib.SequenceMatcher(None, _normalise(module), _normalise(line)).ratio() for line in lines]
+    best = ratios.index(max(ratios))
+    start = len("\n".join(lines[:best]))
+    return text[start:start + EXCERPT_CHARS].strip()
+
+
+def fetch_missing_topics(chat, modules, syllabus_text):
+    """Ask the model for the topics of just the given modules, in one small call.
+
+    Pass a chat without history; a chat session resends its whole history with every message.
+    """
+    with span("prompt build", modules=len(modules)):
+        excerpts = "\n\n".join(f"{module}:\n{syllabus_excerpt(syllabus_text, module)}" for module in modules)
+        prompt = MODULE_TOPICS_PROMPT.format(modules="\n".join(f"- {module}" for module in modules), excerpts=excerpts)
+    topics = parse_json_response(chat.send_message(prompt).text) or {}
+    aligned, _ = align_modules(modules, topics)
+    return aligned
@@ -0,0 +1,101 @@
+import re
+import time
+
+from prompts.tabler_prompt import TABLER_PROMPT
+from prompts.dictator_prompt import DICTATOR_PROMPT
+from prompts.prompter_prompt import PROMPTER_PROMPT
+from prompts.outline_request_prompt import OUTLINE_REQUEST_PROMPT
+from utils.json_stream import parse_json_response
+from utils.metrics import response_tokens
+from utils.tracing import traced
+
+OUTLINE_SECTIONS = [
+    "Course Code and Course Title",
+    "Pre-requisite",
+    "Syllabus Version",
+    "Total Lecture Hours",
+    "Course Objectives",
+    "Course Outcomes",
+    "Module Structure",
+    "Textbooks",
+    "Reference Books",
+]
+
+
+@traced("prompt build")
+def build_tabler_request(course_details):
+    """Build the Tabler request for the course form fields without a model call."""
+    return TABLER_PROMPT + "\n\n" + OUTLINE_REQUEST_PROMPT.format(**course_details)
+
+
+def generate_outline_fast(chat, course_details):
+    """Generate a course outline with a single model call.
+
+    Returns the outline text and the token count of the call.
+    """
+    response = chat.send_message(build_tabler_request(course_details))
+    return response.text, response_tokens(response)
+
+
+def generate_outline_with_prompter(chat, course_details):
+    """Generate a course outline by having Prompter write the Tabler prompt first.
+
+    Returns the outline text and the token count across all three calls.
+    """
+    response = chat.send_message(PROMPTER_PROMPT.format(**course_details))
+    generated_prompt = response.text
+    tokens = response_tokens(response)
+
+    response = chat.send_message(TABLER_PROMPT)
+    tokens += response_tokens(response)
+    response = chat.send_message(generated_prompt)
+    tokens += response_tokens(response)
+
+    return response.text, tokens
+
+
+def outline_structure(outline):
+    """Summarise the structure of an outline for comparison between paths."""
+    modules = set(re.findall(r"Module\s+(\d+)", outline))
+    subtopics = re.findall(r"^\s*[-*]\s+(?!\*\*)", outline, flags=re.MULTILINE)
+    return {
+        "modules": len(modules),
+        "sections": sum(1 for section in OUTLINE_SECTIONS if section in outline),
+        "subtopics": len(subtopics),
+    }
+
+
+def compare_outline_paths(model, course_details, runs=1):
+    """A/B the Prompter and fast outline paths on the same course details.
+
+    Each run uses a fresh chat per path. Returns one result row per run and path
+    with latency in seconds, tokens and the outline structure.
+    """
+    paths = {
+        "prompter": generate_outline_with_prompter,
+        "fast": generate_outline_fast,
+    }
+    results = []
+    for run in range(runs):
+        for name, generate in paths.items():
+            chat = model.start_chat(history=[])
+            started = time.perf_counter()
+            outline, tokens = generate(chat, course_details)
+            results.append({
+                "run": run + 1,
+                "path": name,
+                "latency": round(time.perf_counter() - started, 2),
+                "tokens": tokens,
+                **outline_structure(outline),
+            })
+    return results
+
+
+def extract_module_lessons(chat, outline):
+    """Ask DICTator for the module -> lessons dictionary of a course outline."""
+    chat.send_message(DICTATOR_PROMPT)
+    response = chat.send_message(outline)
+    module_lessons = parse_json_response(response.text)
+    if module_lessons is None:
+        raise ValueError("DICTator did not return a module dictionary")
+    return module_lessons
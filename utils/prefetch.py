@@ -0,0 +1,90 @@
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# Background model calls are shared by every session of the server process.
+MAX_SPECULATIVE_WORKERS = int(os.getenv("SPECULATIVE_WORKERS", "4"))
+# Speculative calls a single session may start, whether or not they are used.
+MAX_SPECULATIVE_CALLS = int(os.getenv("SPECULATIVE_MAX_CALLS", "6"))
+
+_executor = ThreadPoolExecutor(max_workers=MAX_SPECULATIVE_WORKERS, thread_name_prefix="speculative")
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+def _done(future):
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+def _fingerprint(source):
+    # Keep a digest rather than the (possibly large) source text in session state
+    return hashlib.sha1(str(source).encode("utf-8")).hexdigest()
+
+
+def _entries(state):
+    if "speculative" not in state:
+        state["speculative"] = {"spent": 0, "results": {}}
+    return state["speculative"]
+
+
+def speculate(state, key, source, fn, *args):
+    """Start computing fn(*args) in the background for a likely next step.
+
+    The result is stored under key in the session state and is only valid for
+    the given source (e.g. the outline text it was computed from). Nothing is
+    started once the session spent its speculative budget or all workers are busy.
+    """
+    global _pending
+    source = _fingerprint(source)
+    entries = _entries(state)
+    entry = entries["results"].get(key)
+    if entry and entry["source"] == source:
+        return
+    cancel(state, key)
+
+    if entries["spent"] >= MAX_SPECULATIVE_CALLS:
+        return
+    with _pending_lock:
+        if _pending >= MAX_SPECULATIVE_WORKERS:
+            return
+        _pending += 1
+
+    future = _executor.submit(fn, *args)
+    future.add_done_callback(_done)
+    entries["spent"] += 1
+    entries["results"][key] = {"source": source, "future": future}
+
+
+def take(state, key, source, fn, *args):
+    """Return the result for source, reusing a speculative run when there is one.
+
+    Waits for a speculative run that is still in flight. Without one, or if it
+    failed, computes fn(*args) inline and keeps the result for later reruns.
+    """
+    source = _fingerprint(source)
+    entries = _entries(state)
+    entry = entries["results"].get(key)
+    if entry and entry["source"] == source and not entry["future"].cancelled():
+        try:
+            return entry["future"].result()
+        except Exception as e:
+            print(f"Speculative {key} failed, recomputing: {e}")
+
+    result = fn(*args)
+    future = Future()
+    future.set_result(result)
+    entries["results"][key] = {"source": source, "future": future}
+    return result
+
+
+def cancel(state, key=None):
+    """Drop speculative results for key, or for every key when key is None."""
+    results = _entries(state)["results"]
+    keys = list(results) if key is None else [key]
+    for name in keys:
+        entry = results.pop(name, None)
+        if entry:
+            entry["future"].cancel()
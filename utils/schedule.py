@@ -0,0 +1,134 @@
+import os
+import time
+from datetime import timedelta
+
+from prompts.schedule_batch_prompt import SCHEDULE_BATCH_MODULE, SCHEDULE_BATCH_PROMPT
+from utils.json_stream import stream_json_entries
+from utils.llm import LazyChat
+from utils.modules import align_modules
+from utils.tracing import add_span, span
+
+# Estimated tokens, prompt plus expected answer, packed into one combined schedule request.
+SCHEDULE_BATCH_TOKENS = int(os.getenv("SCHEDULE_BATCH_TOKENS", "4000"))
+# Rough answer size of one scheduled week, used to estimate how much a module adds to a batch.
+WEEK_TOKENS = 120
+# Teaching hours scheduled per week.
+HOURS_PER_WEEK = 3
+
+
+def module_weeks(hours):
+    """Return the number of weeks a module of the given hours is scheduled over."""
+    return max(1, round(hours / HOURS_PER_WEEK))
+
+
+def estimate_tokens(text):
+    """Rough token count of a text, at about four characters per token."""
+    return len(text) // 4 + 1
+
+
+def _module_block(module, content, hours, start_date):
+    return SCHEDULE_BATCH_MODULE.format(module=module, content=content, hours=hours, start_date=start_date)
+
+
+def pack_modules(modules, budget=None):
+    """Group (module, content, hours, start_date) tuples into batches that fit the token budget.
+
+    Modules keep their order; a module over the budget on its own gets a batch to itself.
+    """
+    budget = SCHEDULE_BATCH_TOKENS if budget is None else budget
+    overhead = estimate_tokens(SCHEDULE_BATCH_PROMPT)
+    batches = []
+    batch = []
+    used = overhead
+    for item in modules:
+        cost = estimate_tokens(_module_block(*item)) + module_weeks(item[2]) * WEEK_TOKENS
+        if batch and used + cost > budget:
+            batches.append(batch)
+            batch = []
+            used = overhead
+        batch.append(item)
+        used += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def is_week(details):
+    """Return whether a schedule entry is a week, not e.g. a stray "notes" string."""
+    return isinstance(details, dict) and "dates" in details and "topics" in details
+
+
+def _is_schedule(value):
+    return bool(value) and isinstance(value, dict) and all(is_week(details) for details in value.values())
+
+
+def schedule_batch(batch, on_module=None):
+    """Ask for the schedules of a batch of modules in one request.
+
+    Returns the schedules that parsed, keyed by the requested module names.
+    Modules the answer leaves out or garbles are missing from the result, as
+    are any not yet received if the request fails part way; the failure is
+    printed and recorded in the "schedule batch" trace span.
+    """
+    with span("prompt build", modules=len(batch)):
+        prompt = SCHEDULE_BATCH_PROMPT.format(modules="\n".join(_module_block(*item) for item in batch))
+    names = [item[0] for item in batch]
+    schedules = {}
+    started = time.perf_counter()
+    error = None
+    try:
+        for module, schedule in stream_json_entries(LazyChat("schedule").send_message(prompt, stream=True)):
+            if not _is_schedule(schedule):
+                continue
+            # The model may reword a module name, so match it back to the one asked for
+            aligned, _ = align_modules([name for name in names if name not in schedules], {module: schedule})
+            for name, value in aligned.items():
+                schedules[name] = value
+                if on_module:
+                    on_module(name, value)
+    except Exception as e:
+        # The modules not received yet fall back to one request each, which may fail the same way
+        error = repr(e)
+        print(f"Batched schedule request for {len(batch)} modules failed, falling back per module: {error}")
+    add_span("schedule batch", started, modules=len(batch), received=len(schedules), error=error)
+    return schedules
+
+
+def generate_schedules(modules, fallback, on_module=None, budget=None):
+    """Generate the schedules of many modules in as few requests as the token budget allows.
+
+    modules is a list of (module, content, hours, start_date) tuples. Each
+    batch of several modules is sent as one request for a JSON object keyed
+    by module, and on_module(module, schedule) is called as each schedule in
+    it arrives. Modules batched alone, and any a batch did not return a valid
+    schedule for, are generated one at a time with fallback(module, content,
+    hours, start_date), which reports its own progress.
+    """
+    schedules = {}
+    for batch in pack_modules(modules, budget):
+        found = schedule_batch(batch, on_module) if len(batch) > 1 else {}
+        for item in batch:
+            schedule = found.get(item[0]) or fallback(*item)
+            if schedule:
+                schedules[item[0]] = schedule
+    return schedules
+
+
+def layout_schedule(schedules, start_date):
+    """Give the weeks of the module schedules consecutive calendar weeks from start_date.
+
+    Modules follow each other in order. The model's own dates are replaced, so
+    a new start date only needs this local pass, not new requests. Entries
+    that are not weeks are left out.
+    """
+    laid_out = {}
+    week_start = start_date
+    for module, weeks in schedules.items():
+        laid_out[module] = {}
+        for week, details in weeks.items():
+            if not isinstance(details, dict):
+                continue
+            week_end = week_start + timedelta(days=7)
+            laid_out[module][week] = {**details, "dates": f"{week_start:%Y-%m-%d} - {week_end:%Y-%m-%d}"}
+            week_start = week_end
+    return laid_out
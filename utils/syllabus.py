@@ -0,0 +1,78 @@
+import re
+
+from utils.tracing import traced
+
+# Patterns for the parts of a syllabus the prompts need, with the weight of each match.
+SECTION_PATTERNS = {
+    "modules": (re.compile(r"\b(?:module|unit)\s*[-:#]?\s*(?:\d+|[ivx]+)\b", re.IGNORECASE), 3),
+    "hours": (re.compile(r"\b\d+\s*(?:hours|hrs|hr)\b|\b(?:lecture|contact)\s+hours\b", re.IGNORECASE), 2),
+    "books": (re.compile(r"\btext\s*-?\s*books?\b|\breference\s+books?\b", re.IGNORECASE), 3),
+    "objectives": (re.compile(r"\bcourse\s+(?:objectives|outcomes)\b|\blearning\s+outcomes\b", re.IGNORECASE), 2),
+    "course": (re.compile(r"\bcourse\s+(?:code|title)\b|\bpre-?requisites?\b|\bcredits?\b|\bsyllabus\b", re.IGNORECASE), 1),
+}
+
+# Sections that, once found, mean the rest of the document is appendix material.
+REQUIRED_SECTIONS = ("modules", "books")
+
+# Pages scoring below this are left out unless they sit between relevant pages.
+PAGE_SCORE_THRESHOLD = 3
+
+# Consecutive low-scoring pages, after the required sections, that end the syllabus.
+END_GAP_PAGES = 2
+
+
+def score_page(text):
+    """Score how much a page looks like syllabus content and return (score, sections found)."""
+    score = 0
+    sections = set()
+    for line in text.splitlines():
+        # Short lines are usually headings, which count double
+        weight = 2 if 0 < len(line.strip()) <= 80 else 1
+        for name, (pattern, value) in SECTION_PATTERNS.items():
+            matches = len(pattern.findall(line))
+            if matches:
+                score += matches * value * weight
+                sections.add(name)
+    return score, sections
+
+
+@traced("pdf parse")
+def extract_syllabus_text(file, relevant_only=True):
+    """Extract the text of a syllabus PDF, keeping the span of pages that score as syllabus content.
+
+    Low-scoring pages between relevant ones are kept, since a module's topics
+    can run onto a page with no headings. Reading stops once the module and
+    book sections have been found and END_GAP_PAGES low-scoring pages follow.
+    Returns the text, the number of pages used and the page count. Falls back
+    to every page when relevant_only is False or no page scores as relevant.
+    """
+    from PyPDF2 import PdfReader
+
+    reader = PdfReader(file)
+    page_count = len(reader.pages)
+    if not relevant_only:
+        return "\n".join(page.extract_text() for page in reader.pages).strip(), page_count, page_count
+
+    kept = []
+    gap = []
+    found = set()
+    texts = []
+    for page in reader.pages:
+        text = page.extract_text()
+        texts.append(text)
+        score, sections = score_page(text)
+        if score >= PAGE_SCORE_THRESHOLD:
+            # The low-scoring pages since the last relevant one belong to the span
+            kept.extend(gap)
+            gap = []
+            kept.append(text)
+            found |= sections
+        elif kept:
+            gap.append(text)
+            if len(gap) >= END_GAP_PAGES and found.issuperset(REQUIRED_SECTIONS):
+                break
+
+    if not kept:
+        texts.extend(page.extract_text() for page in reader.pages[len(texts):])
+        return "\n".join(texts).strip(), page_count, page_count
+    return "\n".join(kept).strip(), len(kept), page_count
@@ -0,0 +1,142 @@
+import cProfile
+import functools
+import json
+import marshal
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# File spans are appended to in Chrome trace-event format; unset to turn tracing off.
+# Open it in chrome://tracing or https://ui.perfetto.dev.
+TRACE_FILE = os.getenv("TRACE_FILE")
+
+_file = None
+_lock = threading.Lock()
+
+
+def _write(event):
+    global _file
+    with _lock:
+        if _file is None:
+            os.makedirs(os.path.dirname(os.path.abspath(TRACE_FILE)), exist_ok=True)
+            _file = open(TRACE_FILE, "a", encoding="utf-8")
+            # The JSON array format may be left unterminated, so every process can keep appending
+            if _file.tell() == 0:
+                _file.write("[\n")
+        _file.write(json.dumps(event, default=str) + ",\n")
+        _file.flush()
+
+
+def add_span(name, started, seconds=None, **args):
+    """Record a span that began at perf_counter() time started and lasted seconds (until now by default)."""
+    if not TRACE_FILE:
+        return
+    if seconds is None:
+        seconds = time.perf_counter() - started
+    _write({
+        "name": name,
+        "ph": "X",
+        "ts": round(started * 1e6),
+        "dur": round(seconds * 1e6),
+        "pid": os.getpid(),
+        "tid": threading.get_ident(),
+        "args": args,
+    })
+
+
+@contextmanager
+def _span(name, args):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_span(name, started, **args)
+
+
+def span(name, **args):
+    """Context manager recording the time spent in its block as a trace span."""
+    return _span(name, args) if TRACE_FILE else nullcontext()
+
+
+def traced(name):
+    """Decorator recording every call of a function as a trace span."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# Profilers of page runs that st.stop(), a rerun or an exception ended before end_page(), by thread
+_leftover_profilers = {}
+
+
+class _PageRun:
+    """One rerun of a page script, traced as a span and optionally run under cProfile."""
+
+    def __init__(self, page, state, profile=False, placeholder=None):
+        self.page = page
+        self.state = state
+        self.placeholder = placeholder
+        self.started = time.perf_counter()
+        self.profiler = cProfile.Profile() if profile else None
+        if self.profiler:
+            self.profiler.enable()
+            state["page_run"] = self
+            with _lock:
+                _leftover_profilers[threading.get_ident()] = self.profiler
+
+    def finish(self):
+        """End the run and return the profile in pstats format, or None when not profiling."""
+        if self.state.get("page_run") is self:
+            del self.state["page_run"]
+        add_span(f"page {self.page}", self.started, profiled=self.profiler is not None)
+        if self.profiler is None:
+            return None
+        self.profiler.disable()
+        with _lock:
+            if _leftover_profilers.get(threading.get_ident()) is self.profiler:
+                del _leftover_profilers[threading.get_ident()]
+        self.profiler.create_stats()
+        profile = marshal.dumps(self.profiler.stats)
+        self.profiler = None
+        return profile
+
+
+def _offer_profile(placeholder, page, profile, label="Download profile"):
+    placeholder.download_button(label, data=profile, file_name=f"{page}.prof", mime="application/octet-stream")
+
+
+def begin_page(state, page):
+    """Start tracing a rerun of a page and render its profiling toggle in the sidebar.
+
+    Call it after st.set_page_config(). When the toggle is on, the run is
+    profiled with cProfile until end_page(). A run of this session that
+    st.stop(), a rerun or an exception ended early is finished here instead,
+    and its profile offered for download; any other profiler left running on
+    this thread is disabled.
+    """
+    import streamlit as st
+
+    interrupted = state.pop("page_run", None)
+    interrupted_profile = interrupted.finish() if interrupted else None
+    with _lock:
+        leftover = _leftover_profilers.pop(threading.get_ident(), None)
+    if leftover:
+        leftover.disable()
+
+    profile = st.sidebar.checkbox("Profile this page", key="profile_page",
+                                  help="Run this page's script under cProfile on each rerun and offer the profile for download.")
+    if interrupted_profile:
+        _offer_profile(st.sidebar, interrupted.page, interrupted_profile, "Download profile of the interrupted run")
+    return _PageRun(page, state, profile=profile, placeholder=st.sidebar.empty())
+
+
+def end_page(run):
+    """Finish a page rerun, offering its profile for download when it was profiled."""
+    profile = run.finish()
+    if profile:
+        _offer_profile(run.placeholder, run.page, profile)
@@ -0,0 +1,40 @@
+import importlib
+import os
+import threading
+
+# Modules that are imported lazily by the pages, heaviest first.
+WARMUP_MODULES = [
+    "google.generativeai",
+    "pandas",
+    "plotly.express",
+    "plotly.figure_factory",
+    "PyPDF2",
+    "fpdf",
+    "icalendar",
+]
+
+_started = False
+_started_lock = threading.Lock()
+
+
+def _import_all():
+    for name in WARMUP_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"Warm-up could not import {name}: {e}")
+
+
+def start_warmup():
+    """Import the lazily loaded dependencies in a background thread, once per process.
+
+    Set WARMUP_IMPORTS=0 to disable, e.g. when measuring cold start.
+    """
+    global _started
+    if os.getenv("WARMUP_IMPORTS", "1") == "0":
+        return
+    with _started_lock:
+        if _started:
+            return
+        _started = True
+    threading.Thread(target=_import_all, name="import-warmup", daemon=True).start()